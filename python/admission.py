@@ -0,0 +1,140 @@
+import asyncio
+import functools
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Callable
+
+
+class OverloadedError(RuntimeError):
+    """Raised when a call is shed: its wait queue is full or it waited past its deadline."""
+
+
+class ConcurrencyLimiter:
+    """At most `limit` concurrent holders, a FIFO wait queue of `max_queue`, and a wait deadline."""
+
+    def __init__(self, name: str, limit: int, max_queue: int, timeout: float | None):
+        if limit < 1 or max_queue < 0:
+            raise ValueError(f"Invalid limits for {name}: limit={limit}, max_queue={max_queue}.")
+        self.name = name
+        self.limit = limit
+        self.max_queue = max_queue
+        self.timeout = timeout
+        self.active = 0
+        self._waiters: deque[asyncio.Future] = deque()
+        self.admitted = 0
+        self.rejected = 0
+        self.timed_out = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    @property
+    def queued(self) -> int:
+        return len(self._waiters)
+
+    async def acquire(self, timeout: float | None = -1.0) -> None:
+        """Takes a slot, waiting up to `timeout` seconds (default: the limiter's own timeout)."""
+        if timeout is not None and timeout < 0:
+            timeout = self.timeout
+        if self.active < self.limit and not self._waiters:
+            self.active += 1
+            self.admitted += 1
+            return
+        if len(self._waiters) >= self.max_queue:
+            self.rejected += 1
+            raise OverloadedError(f"{self.name} is overloaded: {self.active} running and {len(self._waiters)} queued.")
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        started = time.monotonic()
+        try:
+            await asyncio.wait_for(waiter, timeout)
+        except BaseException as e:
+            if waiter.done() and not waiter.cancelled():
+                self.release()  # The slot was handed over just as we gave up; pass it on.
+            else:
+                waiter.cancel()
+                try:
+                    self._waiters.remove(waiter)
+                except ValueError:
+                    pass
+            if isinstance(e, asyncio.TimeoutError):
+                self.timed_out += 1
+                raise OverloadedError(f"{self.name} is overloaded: no slot within {timeout}s.") from None
+            raise
+        waited = time.monotonic() - started
+        self.total_wait += waited
+        self.max_wait = max(self.max_wait, waited)
+        self.admitted += 1
+
+    def release(self) -> None:
+        # Hand the slot straight to the oldest live waiter so newcomers cannot barge in.
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self.active -= 1
+
+    def stats(self) -> dict:
+        return {
+            "limit": self.limit,
+            "active": self.active,
+            "queued": self.queued,
+            "admitted": self.admitted,
+            "rejected": self.rejected,
+            "timed_out": self.timed_out,
+            "mean_wait_ms": (self.total_wait / self.admitted * 1000) if self.admitted else 0.0,
+            "max_wait_ms": self.max_wait * 1000,
+        }
+
+
+class AdmissionController:
+    """Per-tool and global concurrency limits for expensive handlers.
+
+    A handler wrapped with `limited(...)` must hold a slot in its own
+    limiter and then in the global one. Handlers that are not wrapped (cheap
+    calls such as `echo`) never queue behind them. Full queues and expired
+    waits raise `OverloadedError` straight away instead of piling up coroutines.
+    """
+
+    def __init__(self, global_limit: int = 32, global_queue: int = 128, timeout: float | None = 30.0):
+        self.timeout = timeout
+        self.global_limiter = ConcurrencyLimiter("server", global_limit, global_queue, timeout)
+        self.limiters: dict[str, ConcurrencyLimiter] = {}
+
+    @asynccontextmanager
+    async def admit(self, name: str) -> AsyncIterator[None]:
+        limiter = self.limiters[name]
+        # One deadline covers both queues.
+        deadline = time.monotonic() + limiter.timeout if limiter.timeout is not None else None
+        await limiter.acquire(limiter.timeout)
+        try:
+            await self.global_limiter.acquire(max(0.0, deadline - time.monotonic()) if deadline is not None else None)
+        except BaseException:
+            limiter.release()
+            raise
+        try:
+            yield
+        finally:
+            self.global_limiter.release()
+            limiter.release()
+
+    def limited(self, limit: int, max_queue: int, timeout: float | None = None, name: str | None = None) -> Callable:
+        def decorator(func: Callable) -> Callable:
+            limiter_name = name or func.__name__
+            self.limiters[limiter_name] = ConcurrencyLimiter(limiter_name, limit, max_queue, timeout if timeout is not None else self.timeout)
+
+            @functools.wraps(func)
+            async def wrapper(*args, **kwargs):
+                async with self.admit(limiter_name):
+                    return await func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def stats(self) -> dict:
+        """Flat `<limiter>_<stat>` numbers, suitable for the metrics collectors."""
+        flat = {}
+        for limiter in [self.global_limiter, *self.limiters.values()]:
+            for key, value in limiter.stats().items():
+                flat[f"{limiter.name}_{key}"] = value
+        return flat
@@ -0,0 +1,70 @@
+import asyncio
+import functools
+import inspect
+import json
+from typing import Any, Awaitable, Callable
+
+MAX_BATCH_CALLS = 1000
+# Injected by the server's tool-invocation path, never supplied by a batch call.
+_INJECTED_PARAMETERS = frozenset({"ctx"})
+
+
+def _jsonable(value: Any) -> Any:
+    """Fallback for json.dumps: content objects are rendered through their fields."""
+    if hasattr(value, "model_dump"):
+        return value.model_dump()
+    if hasattr(value, "__dict__"):
+        return vars(value)
+    return str(value)
+
+
+@functools.cache
+def _signature(handler: Callable) -> inspect.Signature:
+    """The handler's signature without injected parameters, computed once per handler."""
+    signature = inspect.signature(handler)
+    return signature.replace(parameters=[p for name, p in signature.parameters.items() if name not in _INJECTED_PARAMETERS])
+
+
+async def run_batch(handlers: dict[str, Callable], calls: list[dict], invoke: Callable[[str, dict], Awaitable[Any]],
+                    max_concurrency: int = 16) -> list[dict]:
+    """Runs `{"tool": name, "arguments": {...}}` sub-calls concurrently, at most `max_concurrency` at a time.
+
+    `handlers` lists the batchable tools; each sub-call is then made with
+    `invoke(name, arguments)`, the server's own tool-invocation path, so its
+    arguments are validated against the tool's schema as in a normal call.
+    Returns one `{"index", "tool", "result"}` or `{"index", "tool", "error"}`
+    entry per call, in input order; an unknown tool, bad arguments or a
+    failing call only fails its own entry.
+    """
+    if len(calls) > MAX_BATCH_CALLS:
+        raise ValueError(f"A batch may hold at most {MAX_BATCH_CALLS} calls, got {len(calls)}.")
+    if max_concurrency < 1:
+        raise ValueError(f"max_concurrency must be at least 1, got {max_concurrency}.")
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def run_one(index: int, call: Any) -> dict:
+        name = call.get("tool") if isinstance(call, dict) else None
+        handler = handlers.get(name) if isinstance(name, str) else None
+        if handler is None:
+            return {"index": index, "tool": name, "error": f"Unknown or non-batchable tool: {name!r}"}
+        arguments = call.get("arguments")
+        if arguments is None:
+            arguments = {}
+        if not isinstance(arguments, dict):
+            return {"index": index, "tool": name, "error": f"Arguments must be an object, got {type(arguments).__name__}."}
+        try:
+            _signature(handler).bind(**arguments)
+        except TypeError as e:
+            return {"index": index, "tool": name, "error": f"Invalid arguments for {name}: {e}"}
+        async with semaphore:
+            try:
+                result = await invoke(name, arguments)
+            except Exception as e:
+                return {"index": index, "tool": name, "error": str(e) or type(e).__name__}
+        return {"index": index, "tool": name, "result": result}
+
+    return list(await asyncio.gather(*(run_one(i, call) for i, call in enumerate(calls))))
+
+
+def encode_batch_results(results: list[dict]) -> str:
+    return json.dumps(results, default=_jsonable)
@@ -0,0 +1,230 @@
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+from contextlib import AsyncExitStack
+from typing import Awaitable, Callable
+
+from mcp import StdioServerParameters
+from mcp.client.session import ClientSession
+from mcp.client.stdio import stdio_client
+from mcp.types import PromptReference
+
+from mcp_client import connect_in_process
+
+PYTHON_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+# --- Operations ---
+# Each operation issues exactly one MCP request on the given session.
+async def op_echo(session: ClientSession, rng: random.Random) -> None:
+    await session.call_tool(name="echo", arguments={"message": "benchmark"})
+
+async def op_add(session: ClientSession, rng: random.Random) -> None:
+    await session.call_tool(name="add", arguments={"a": rng.randint(0, 1000), "b": rng.randint(0, 1000)})
+
+async def op_get_tiny_image(session: ClientSession, rng: random.Random) -> None:
+    await session.call_tool(name="get_tiny_image", arguments={})
+
+async def op_annotated_message(session: ClientSession, rng: random.Random) -> None:
+    await session.call_tool(name="annotated_message", arguments={
+        "message_type": rng.choice(["error", "success", "debug"]),
+        "include_image": rng.random() < 0.5,
+    })
+
+async def op_resource_list(session: ClientSession, rng: random.Random) -> None:
+    await session.list_resources()
+
+async def op_resource_read(session: ClientSession, rng: random.Random) -> None:
+    await session.read_resource(f"test://static/resource/{rng.randint(1, 7)}")
+
+async def op_prompt_get(session: ClientSession, rng: random.Random) -> None:
+    await session.get_prompt("complex_prompt", arguments={"temperature": "0.7", "style": "formal"})
+
+async def op_completion(session: ClientSession, rng: random.Random) -> None:
+    await session.complete(
+        ref=PromptReference(type="ref/prompt", name="complex_prompt"),
+        argument={"name": "style", "value": rng.choice(["", "c", "f", "t"])},
+    )
+
+OPERATIONS: dict[str, Callable[[ClientSession, random.Random], Awaitable[None]]] = {
+    "echo": op_echo,
+    "add": op_add,
+    "get_tiny_image": op_get_tiny_image,
+    "annotated_message": op_annotated_message,
+    "resource_list": op_resource_list,
+    "resource_read": op_resource_read,
+    "prompt_get": op_prompt_get,
+    "completion": op_completion,
+}
+
+DEFAULT_MIX = "echo=4,add=4,get_tiny_image=1,annotated_message=1,resource_list=1,resource_read=2,prompt_get=1,completion=2"
+
+
+def parse_mix(mix: str) -> dict[str, float]:
+    """Parses 'echo=4,add=1' into {'echo': 4.0, 'add': 1.0}; a bare name gets weight 1."""
+    weights: dict[str, float] = {}
+    for part in mix.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in OPERATIONS:
+            raise ValueError(f"Unknown operation '{name}'. Known operations: {', '.join(OPERATIONS)}")
+        weights[name] = float(weight) if weight else 1.0
+        if weights[name] < 0:
+            raise ValueError(f"Weight for '{name}' must be non-negative.")
+    if not weights or sum(weights.values()) <= 0:
+        raise ValueError("Request mix must contain at least one operation with a positive weight.")
+    return weights
+
+
+def percentile(sorted_values: list[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, -(-len(sorted_values) * pct // 100))
+    return sorted_values[int(rank) - 1]
+
+
+def summarize(latencies: dict[str, list[float]], errors: dict[str, int], elapsed: float) -> dict:
+    operations = {}
+    total_requests = 0
+    for name in sorted(set(latencies) | set(errors)):
+        samples = sorted(latencies.get(name, []))
+        total_requests += len(samples)
+        operations[name] = {
+            "count": len(samples),
+            "errors": errors.get(name, 0),
+            "throughput_rps": len(samples) / elapsed if elapsed > 0 else 0.0,
+            "mean_ms": (sum(samples) / len(samples) * 1000) if samples else 0.0,
+            "p50_ms": percentile(samples, 50) * 1000,
+            "p95_ms": percentile(samples, 95) * 1000,
+            "p99_ms": percentile(samples, 99) * 1000,
+        }
+    return {
+        "elapsed_s": elapsed,
+        "total_requests": total_requests,
+        "total_errors": sum(errors.values()),
+        "throughput_rps": total_requests / elapsed if elapsed > 0 else 0.0,
+        "operations": operations,
+    }
+
+
+def compare_to_baseline(results: dict, baseline: dict, tolerance: float) -> list[str]:
+    """Returns human-readable regressions where results are worse than baseline by more than `tolerance`."""
+    regressions = []
+    for name, base_op in baseline.get("operations", {}).items():
+        current_op = results["operations"].get(name)
+        if current_op is None or not base_op.get("count"):
+            continue
+        for key in ("p50_ms", "p95_ms", "p99_ms"):
+            if base_op[key] > 0 and current_op[key] > base_op[key] * (1 + tolerance):
+                regressions.append(f"{name} {key}: {current_op[key]:.2f} > baseline {base_op[key]:.2f}")
+        if current_op["throughput_rps"] < base_op["throughput_rps"] * (1 - tolerance):
+            regressions.append(f"{name} throughput_rps: {current_op['throughput_rps']:.1f} < baseline {base_op['throughput_rps']:.1f}")
+    base_total = baseline.get("throughput_rps", 0)
+    if base_total and results["throughput_rps"] < base_total * (1 - tolerance):
+        regressions.append(f"total throughput_rps: {results['throughput_rps']:.1f} < baseline {base_total:.1f}")
+    return regressions
+
+
+async def open_stdio_session(stack: AsyncExitStack) -> ClientSession:
+    server_params = StdioServerParameters(command=sys.executable, args=["mcp_server.py"], cwd=PYTHON_DIR)
+    reader, writer = await stack.enter_async_context(stdio_client(server_params))
+    session = await stack.enter_async_context(ClientSession(reader, writer))
+    await session.initialize()
+    return session
+
+
+async def open_in_process_session(stack: AsyncExitStack) -> ClientSession:
+    from mcp_server import create_server  # Only needed for in-process runs.
+    return await stack.enter_async_context(connect_in_process(create_server()))
+
+
+async def run_benchmark(sessions: int, requests_per_session: int, mix: dict[str, float], warmup: int = 0, seed: int | None = None, in_process: bool = False) -> dict:
+    """Drives `sessions` concurrent client sessions, each issuing `requests_per_session` requests drawn from `mix`."""
+    names = list(mix)
+    weights = [mix[name] for name in names]
+    latencies: dict[str, list[float]] = {name: [] for name in names}
+    errors: dict[str, int] = {}
+
+    async def warm(session: ClientSession, worker_seed: int) -> None:
+        rng = random.Random(worker_seed ^ 0x5EED)
+        for _ in range(warmup):
+            await OPERATIONS[rng.choices(names, weights)[0]](session, rng)
+
+    async def worker(session: ClientSession, worker_seed: int) -> None:
+        rng = random.Random(worker_seed)
+        for _ in range(requests_per_session):
+            name = rng.choices(names, weights)[0]
+            started = time.perf_counter()
+            try:
+                await OPERATIONS[name](session, rng)
+            except Exception as e:
+                errors[name] = errors.get(name, 0) + 1
+                print(f"[BENCH_LOG] {name} failed: {e}", file=sys.stderr, flush=True)
+                continue
+            latencies[name].append(time.perf_counter() - started)
+
+    base_seed = seed if seed is not None else random.randrange(2**32)
+    async with AsyncExitStack() as stack:
+        # Sessions are opened sequentially: the stdio transports' cancel scopes
+        # must be exited by the task that entered them.
+        open_session = open_in_process_session if in_process else open_stdio_session
+        opened = [await open_session(stack) for _ in range(sessions)]
+        # Warmup requests run before the clock starts.
+        await asyncio.gather(*(warm(session, base_seed + i) for i, session in enumerate(opened)))
+        started = time.perf_counter()
+        await asyncio.gather(*(worker(session, base_seed + i) for i, session in enumerate(opened)))
+        elapsed = time.perf_counter() - started
+    results = summarize(latencies, errors, elapsed)
+    results["config"] = {"sessions": sessions, "requests_per_session": requests_per_session, "mix": mix, "warmup": warmup, "seed": base_seed, "in_process": in_process}
+    return results
+
+
+def print_report(results: dict) -> None:
+    print(f"{'operation':<20}{'count':>8}{'errors':>8}{'rps':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    for name, op in results["operations"].items():
+        print(f"{name:<20}{op['count']:>8}{op['errors']:>8}{op['throughput_rps']:>10.1f}{op['p50_ms']:>10.2f}{op['p95_ms']:>10.2f}{op['p99_ms']:>10.2f}")
+    print(f"Total: {results['total_requests']} requests, {results['total_errors']} errors, "
+          f"{results['throughput_rps']:.1f} req/s in {results['elapsed_s']:.2f}s")
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Load and latency benchmark for mcp_server.py.")
+    parser.add_argument("--sessions", type=int, default=4, help="Number of concurrent client sessions.")
+    parser.add_argument("--requests", type=int, default=200, help="Requests issued per session.")
+    parser.add_argument("--warmup", type=int, default=10, help="Untimed warmup requests per session.")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help="Weighted request mix, e.g. 'echo=4,add=1'.")
+    parser.add_argument("--seed", type=int, default=None, help="Random seed for reproducible request sequences.")
+    parser.add_argument("--in-process", action="store_true", help="Run servers in this process over memory streams instead of stdio subprocesses.")
+    parser.add_argument("--output", help="Write JSON results to this file.")
+    parser.add_argument("--baseline", help="Compare against JSON results from a previous run.")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed relative regression against the baseline.")
+    args = parser.parse_args(argv)
+
+    results = asyncio.run(run_benchmark(args.sessions, args.requests, parse_mix(args.mix), warmup=args.warmup, seed=args.seed, in_process=args.in_process))
+    print_report(results)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare_to_baseline(results, baseline, args.tolerance)
+        if regressions:
+            print("Regressions against baseline:", file=sys.stderr)
+            for regression in regressions:
+                print(f"  {regression}", file=sys.stderr)
+            return 1
+        print("No regressions against baseline.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
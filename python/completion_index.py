@@ -0,0 +1,90 @@
+from bisect import bisect_left
+from typing import Iterable, Protocol
+
+# The MCP spec caps a completion response at 100 values.
+MAX_COMPLETION_VALUES = 100
+# Sorts after every other code point, so `prefix + _PREFIX_END` bounds all keys starting with `prefix`.
+_PREFIX_END = chr(0x10FFFF)
+
+
+class CompletionSource(Protocol):
+    def search(self, prefix: str, limit: int) -> tuple[list[str], int]:
+        """Returns up to `limit` values starting with `prefix` and the total number of matches."""
+        ...
+
+
+class PrefixIndex:
+    """Case-insensitive prefix index over a fixed vocabulary.
+
+    Built once as a sorted array of lowercased keys; a query is two bisects plus
+    a slice of at most `limit` values, independent of the vocabulary size.
+    """
+
+    def __init__(self, values: Iterable[str]):
+        pairs = sorted({(value.lower(), value) for value in values})
+        self._keys = [key for key, _ in pairs]
+        self._values = [value for _, value in pairs]
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def search(self, prefix: str, limit: int) -> tuple[list[str], int]:
+        key = prefix.lower()
+        start = bisect_left(self._keys, key)
+        end = bisect_left(self._keys, key + _PREFIX_END, lo=start)
+        return self._values[start:min(end, start + limit)], end - start
+
+
+class IntegerRangeSource:
+    """Completes decimal ids 1..count without materializing them.
+
+    Matches for a prefix p are the numbers p, p0-p9, p00-p99, ... up to `count`,
+    so both the first `limit` matches (in numeric order) and the total are
+    computed arithmetically.
+    """
+
+    def __init__(self, count: int):
+        self.count = count
+
+    def __len__(self) -> int:
+        return self.count
+
+    def search(self, prefix: str, limit: int) -> tuple[list[str], int]:
+        if self.count < 1:
+            return [], 0
+        if not prefix:
+            return [str(i) for i in range(1, min(self.count, limit) + 1)], self.count
+        if not prefix.isascii() or not prefix.isdigit() or prefix.startswith("0"):
+            return [], 0
+        base = int(prefix)
+        values: list[str] = []
+        total = 0
+        span = 1
+        while base * span <= self.count:
+            low = base * span
+            high = min((base + 1) * span - 1, self.count)
+            total += high - low + 1
+            if len(values) < limit:
+                values.extend(str(i) for i in range(low, min(high, low + limit - len(values) - 1) + 1))
+            span *= 10
+        return values, total
+
+
+class CompletionRegistry:
+    """Completion sources registered per argument name."""
+
+    def __init__(self, max_values: int = MAX_COMPLETION_VALUES):
+        self.max_values = max_values
+        self._sources: dict[str, CompletionSource] = {}
+
+    def register(self, argument_name: str, source: CompletionSource | Iterable[str]) -> None:
+        if not hasattr(source, "search"):
+            source = PrefixIndex(source)
+        self._sources[argument_name] = source
+
+    def complete(self, argument_name: str | None, value: str) -> dict:
+        source = self._sources.get(argument_name) if argument_name else None
+        if source is None:
+            return {"values": [], "has_more": False, "total": 0}
+        values, total = source.search(value, self.max_values)
+        return {"values": values, "has_more": total > len(values), "total": total}
@@ -0,0 +1,73 @@
+import json
+import os
+import re
+from collections import OrderedDict
+
+
+def _raw_environ() -> dict:
+    # On POSIX the bytes view skips decoding every variable; elsewhere compare the str mapping.
+    return dict(os.environb) if os.supports_bytes_environ else dict(os.environ)
+
+
+class EnvironmentSnapshot:
+    """Cached JSON encodings of the process environment for `print_env`.
+
+    Each call compares the live environment against the snapshot taken at the
+    last rebuild, which costs one shallow copy (of the undecoded bytes on
+    POSIX) and one dict comparison. All cached encodings are dropped only when
+    that comparison fails. Encodings are kept per `(prefix, pattern, compact)`
+    combination, up to `max_variants`.
+    """
+
+    def __init__(self, max_variants: int = 64):
+        self.max_variants = max_variants
+        self._raw: dict | None = None
+        self._variables: dict[str, str] = {}
+        self._encoded: OrderedDict[tuple, str] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.rebuilds = 0
+
+    def _refresh(self) -> None:
+        raw = _raw_environ()
+        if self._raw is not None and self._raw == raw:
+            return
+        self._raw = raw
+        self._variables = dict(os.environ)
+        self._encoded.clear()
+        self.rebuilds += 1
+
+    def encode(self, prefix: str | None = None, pattern: str | None = None, compact: bool = False) -> str:
+        """JSON object of the variables whose names start with `prefix` and contain a match for `pattern`."""
+        self._refresh()
+        key = (prefix or "", pattern or "", compact)
+        encoded = self._encoded.get(key)
+        if encoded is not None:
+            self.hits += 1
+            self._encoded.move_to_end(key)
+            return encoded
+        self.misses += 1
+        try:
+            regex = re.compile(pattern) if pattern else None
+        except re.error as e:
+            raise ValueError(f"Invalid pattern {pattern!r}: {e}") from None
+        variables = self._variables
+        if prefix or regex:
+            variables = {
+                name: value for name, value in variables.items()
+                if (not prefix or name.startswith(prefix)) and (regex is None or regex.search(name))
+            }
+        encoded = json.dumps(variables, separators=(",", ":")) if compact else json.dumps(variables, indent=2)
+        self._encoded[key] = encoded
+        while len(self._encoded) > self.max_variants:
+            self._encoded.popitem(last=False)
+        return encoded
+
+    def stats(self) -> dict:
+        return {
+            "variables": len(self._variables),
+            "cached_variants": len(self._encoded),
+            "hits": self.hits,
+            "misses": self.misses,
+            "rebuilds": self.rebuilds,
+        }
@@ -0,0 +1,112 @@
+import base64
+import mimetypes
+import mmap
+import os
+
+FILE_RESOURCE_URI_PREFIX = "test://file/"
+FILE_RESOURCE_DIR_ENV_VAR = "MCP_FILE_RESOURCE_DIR"
+# A multiple of 3, so the base64 of consecutive chunks concatenates to the base64 of the whole file.
+DEFAULT_CHUNK_SIZE = 3 * 256 * 1024
+DEFAULT_MAX_READ = 16 * 1024 * 1024
+
+
+class FileResourceProvider:
+    """Serves the files directly inside `root` as `test://file/{name}` resources.
+
+    Reads go through a read-only `mmap`, so only the requested slice is copied
+    into Python memory and base64-encoded; a multi-hundred-MB file is served as
+    `test://file/{name}/chunk/{index}` or `test://file/{name}/range/{offset}/{length}`
+    reads of at most `max_read` bytes each. The reads are blocking; the server
+    runs them in a worker thread.
+    """
+
+    def __init__(self, root: str, chunk_size: int = DEFAULT_CHUNK_SIZE, max_read: int = DEFAULT_MAX_READ):
+        if chunk_size < 1 or chunk_size > max_read:
+            raise ValueError(f"chunk_size must be between 1 and max_read ({max_read}), got {chunk_size}.")
+        if chunk_size % 3:
+            raise ValueError(f"chunk_size must be a multiple of 3 so base64 chunks concatenate cleanly, got {chunk_size}.")
+        self.root = os.path.realpath(root)
+        if not os.path.isdir(self.root):
+            raise ValueError(f"File resource directory does not exist: {root}")
+        self.chunk_size = chunk_size
+        self.max_read = max_read
+
+    def _inside_root(self, path: str) -> bool:
+        # Symlinks are followed, so a link pointing out of the root does not count.
+        return os.path.dirname(os.path.realpath(path)) == self.root
+
+    def _path(self, name: str) -> str:
+        if not name or "/" in name or "\\" in name or name in (".", ".."):
+            raise ValueError(f"Invalid file resource name: {name!r}")
+        path = os.path.join(self.root, name)
+        if not self._inside_root(path) or not os.path.isfile(path):
+            raise ValueError(f"File resource {name} not found.")
+        return path
+
+    def describe(self, name: str) -> dict:
+        size = os.path.getsize(self._path(name))
+        return {
+            "uri": f"{FILE_RESOURCE_URI_PREFIX}{name}",
+            "name": name,
+            "mime_type": mimetypes.guess_type(name)[0] or "application/octet-stream",
+            "size": size,
+            "chunk_size": self.chunk_size,
+            "chunks": -(-size // self.chunk_size),
+        }
+
+    def list_page(self, start_index: int, page_size: int) -> tuple[list[dict], int | None]:
+        """Returns metadata for one page of files (sorted by name) and the next start index.
+
+        Entries that are not servable, such as symlinks leading out of the root, are skipped.
+        """
+        names = sorted(entry.name for entry in os.scandir(self.root) if entry.is_file() and self._inside_root(entry.path))
+        page = []
+        for name in names[start_index:start_index + page_size]:
+            try:
+                page.append(self.describe(name))
+            except (OSError, ValueError):
+                continue  # Removed or replaced since the directory scan.
+        end_index = start_index + page_size
+        return page, end_index if end_index < len(names) else None
+
+    def read_range(self, name: str, offset: int, length: int) -> dict:
+        if offset < 0 or length < 0:
+            raise ValueError("Range offset and length must be non-negative.")
+        if length > self.max_read:
+            raise ValueError(f"Range length {length} exceeds the {self.max_read}-byte read limit; use chunk reads.")
+        path = self._path(name)
+        with open(path, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            end = min(offset + length, size)
+            if offset >= end:
+                data = b""
+            else:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    data = mapped[offset:end]  # Copies only the requested slice.
+        return {
+            "uri": f"{FILE_RESOURCE_URI_PREFIX}{name}/range/{offset}/{length}",
+            "name": name,
+            "mime_type": mimetypes.guess_type(name)[0] or "application/octet-stream",
+            "blob": base64.b64encode(data).decode("utf-8"),
+            "offset": offset,
+            "length": len(data),
+            "size": size,
+        }
+
+    def read_chunk(self, name: str, index: int) -> dict:
+        if index < 0:
+            raise ValueError("Chunk index must be non-negative.")
+        resource = self.read_range(name, index * self.chunk_size, self.chunk_size)
+        resource["uri"] = f"{FILE_RESOURCE_URI_PREFIX}{name}/chunk/{index}"
+        resource["chunk"] = index
+        resource["chunks"] = -(-resource["size"] // self.chunk_size)
+        return resource
+
+    def read_whole(self, name: str) -> dict:
+        size = os.path.getsize(self._path(name))
+        if size > self.max_read:
+            raise ValueError(f"File resource {name} is {size} bytes, above the {self.max_read}-byte read limit; "
+                             f"read it as {FILE_RESOURCE_URI_PREFIX}{name}/chunk/{{index}} instead.")
+        resource = self.read_range(name, 0, size)
+        resource["uri"] = f"{FILE_RESOURCE_URI_PREFIX}{name}"
+        return resource
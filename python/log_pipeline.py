@@ -0,0 +1,111 @@
+import asyncio
+import sys
+import time
+from collections import deque
+from typing import Awaitable, Callable
+
+LOG_LEVEL_ORDER = ["debug", "info", "notice", "warning", "error", "critical", "alert", "emergency"]
+# Precomputed integer thresholds; a message is sent when its value >= the current level's value.
+LOG_LEVEL_THRESHOLDS = {level: i for i, level in enumerate(LOG_LEVEL_ORDER)}
+
+
+class LogPipeline:
+    """Bounded, rate-limited pipeline for `notifications/message`.
+
+    `submit()` filters a message against the current level and appends it to a
+    ring buffer of `capacity` entries; when full, the oldest entry is dropped.
+    `run()` drains the buffer in batches of up to `batch_size`, limited to
+    `max_rate` messages per second by a token bucket. Level changes apply to
+    messages that are already buffered as well. A `send` that returns 0 reached
+    no recipient; such messages count as `undelivered` rather than `sent`.
+    """
+
+    def __init__(self, level: str = "debug", capacity: int = 1024, max_rate: float = 1000.0, batch_size: int = 100, logger: str = "python-mcp-server"):
+        if max_rate <= 0:
+            raise ValueError(f"max_rate must be positive, got {max_rate}.")
+        self.capacity = capacity
+        self.max_rate = max_rate
+        self.batch_size = batch_size
+        self.logger = logger
+        self._threshold = 0
+        self.set_level(level)
+        self._buffer: deque[tuple[int, str, object]] = deque(maxlen=capacity)
+        self._wakeup = asyncio.Event()
+        self.submitted = 0
+        self.sent = 0
+        self.undelivered = 0
+        self.filtered = 0
+        self.dropped = 0
+        self.failed = 0
+
+    @property
+    def level(self) -> str:
+        return LOG_LEVEL_ORDER[self._threshold]
+
+    def set_level(self, level: str) -> None:
+        threshold = LOG_LEVEL_THRESHOLDS.get(level.lower())
+        if threshold is None:
+            raise ValueError(f"Unknown log level: {level}")
+        self._threshold = threshold
+
+    def submit(self, level: str, data: object) -> bool:
+        """Queues a message; returns False if it was filtered out by the current level."""
+        self.submitted += 1
+        level = level.lower()
+        severity = LOG_LEVEL_THRESHOLDS.get(level, -1)
+        if severity < self._threshold:
+            self.filtered += 1
+            return False
+        if len(self._buffer) == self.capacity:
+            self.dropped += 1  # deque(maxlen) discards the oldest entry on append.
+        self._buffer.append((severity, level, data))
+        self._wakeup.set()
+        return True
+
+    def stats(self) -> dict:
+        return {
+            "level_threshold": self._threshold,
+            "buffered": len(self._buffer),
+            "submitted": self.submitted,
+            "sent": self.sent,
+            "undelivered": self.undelivered,
+            "filtered": self.filtered,
+            "dropped": self.dropped,
+            "failed": self.failed,
+        }
+
+    async def _send(self, send: Callable[..., Awaitable[int | None]], level: str, data: object) -> None:
+        try:
+            recipients = await send(level=level, data=data, logger=self.logger)
+            if recipients == 0:
+                self.undelivered += 1
+            else:
+                self.sent += 1
+        except Exception as e:
+            self.failed += 1
+            print(f"[SERVER_LOG] Error sending log message: {e}", file=sys.stderr, flush=True)
+
+    async def run(self, send: Callable[..., Awaitable[int | None]]) -> None:
+        """Flushes buffered messages through `send(level=, data=, logger=)` until cancelled."""
+        tokens = float(self.batch_size)
+        last_refill = time.monotonic()
+        while True:
+            if not self._buffer:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+            now = time.monotonic()
+            tokens = min(float(self.batch_size), tokens + (now - last_refill) * self.max_rate)
+            last_refill = now
+            if tokens < 1:
+                await asyncio.sleep((1 - tokens) / self.max_rate)
+                continue
+            batch = []
+            while self._buffer and len(batch) < int(tokens):
+                severity, level, data = self._buffer.popleft()
+                if severity < self._threshold:
+                    self.filtered += 1  # Level was raised after the message was queued.
+                    continue
+                batch.append(self._send(send, level, data))
+            tokens -= len(batch)
+            if batch:
+                await asyncio.gather(*batch)
@@ -1,11 +1,37 @@
 import asyncio
+import os
 import sys
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Iterable
+import anyio
 from mcp.client.stdio import stdio_client
 from mcp import StdioServerParameters # Changed import
 from mcp.client.session import ClientSession
+from mcp.shared.memory import create_client_server_memory_streams
 from mcp.types import TextContent
 
 
+@asynccontextmanager
+async def connect_in_process(server) -> AsyncIterator[ClientSession]:
+    """Yields an initialized ClientSession wired to `server` over in-memory streams.
+
+    `server` is typically `mcp_server.create_server()`. No subprocess is spawned
+    and nothing is serialized through pipes, so calls measure handler cost only.
+    """
+    async with create_client_server_memory_streams() as (client_streams, server_streams):
+        async with anyio.create_task_group() as tg:
+            server_read, server_write = server_streams
+            tg.start_soon(server.run_streams, server_read, server_write)
+            try:
+                client_read, client_write = client_streams
+                async with ClientSession(client_read, client_write) as session:
+                    await session.initialize()
+                    yield session
+            finally:
+                tg.cancel_scope.cancel()
+
+
 async def call_echo_tool(session: ClientSession, message: str) -> str:
     """Calls the 'echo' tool on the server and returns the text response."""
     print(f"[CLIENT_LOG] Attempting to call 'echo' tool with message: '{message}'", flush=True)
@@ -32,6 +58,287 @@ async def call_echo_tool(session: ClientSession, message: str) -> str:
         return error_detail
 
 
+async def _run_batch_call(session: ClientSession, call: dict) -> Any:
+    if "tool" in call:
+        return await session.call_tool(name=call["tool"], arguments=call.get("arguments") or {})
+    if "resource" in call:
+        return await session.read_resource(call["resource"])
+    raise ValueError(f"Batch call needs a 'tool' or 'resource' key: {call!r}")
+
+
+async def iter_batch(session: ClientSession, calls: Iterable[dict], window: int = 32) -> AsyncIterator[tuple[int, Any]]:
+    """Pipelines `calls` over one session and yields `(index, result)` in completion order.
+
+    Each call is `{"tool": name, "arguments": {...}}` or `{"resource": uri}`.
+    At most `window` requests are outstanding at once, and `calls` is consumed
+    lazily, so very long batches do not create every request up front. A failed
+    call yields its exception as the result instead of ending the batch. Closing
+    the iterator early cancels the requests still in flight.
+    """
+    if window < 1:
+        raise ValueError(f"Batch window must be at least 1, got {window}.")
+    pending: dict[asyncio.Task, int] = {}
+    calls_iter = enumerate(calls)
+    exhausted = False
+    try:
+        while True:
+            while not exhausted and len(pending) < window:
+                try:
+                    index, call = next(calls_iter)
+                except StopIteration:
+                    exhausted = True
+                    break
+                pending[asyncio.ensure_future(_run_batch_call(session, call))] = index
+            if not pending:
+                return
+            done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                index = pending.pop(task)
+                yield index, task.exception() or task.result()
+    finally:
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+
+
+class _PooledServer:
+    """One warm server process plus its initialized session, owned by a dedicated task.
+
+    The stdio transport's cancel scopes must be entered and exited by the same
+    task, so each pooled connection lives inside `_own()` until `close()`.
+    """
+
+    def __init__(self, server_params: StdioServerParameters):
+        self.server_params = server_params
+        self.session: ClientSession | None = None
+        self.created_at = 0.0
+        self.last_used = 0.0
+        self.requests = 0
+        self._ready: asyncio.Future = asyncio.get_running_loop().create_future()
+        self._closing = asyncio.Event()
+        self._task = asyncio.create_task(self._own())
+
+    async def _own(self) -> None:
+        try:
+            async with stdio_client(self.server_params) as (reader, writer):
+                async with ClientSession(reader, writer) as session:
+                    await session.initialize()
+                    self.session = session
+                    self.created_at = self.last_used = time.monotonic()
+                    self._ready.set_result(None)
+                    await self._closing.wait()
+        except Exception as e:
+            if not self._ready.done():
+                self._ready.set_exception(e)
+            else:
+                print(f"[CLIENT_LOG] Pooled server connection ended with error: {e}", file=sys.stderr, flush=True)
+
+    async def wait_ready(self) -> None:
+        await asyncio.shield(self._ready)  # A cancelled waiter must not cancel the readiness future.
+
+    async def close(self) -> None:
+        self._closing.set()
+        if self.session is None:
+            self._task.cancel()  # Still starting up: stop waiting for initialize.
+        await asyncio.gather(self._task, return_exceptions=True)
+
+
+class _SpawnFailure:
+    """Queued in place of a server whose respawn attempts were exhausted."""
+
+    def __init__(self, error: BaseException | None):
+        self.error = error
+
+
+class ServerPool:
+    """Keeps `size` initialized sessions to `mcp_server.py` processes warm and leases them out.
+
+    Leased sessions are health-checked with a ping when they have been idle for
+    longer than `health_check_interval`, and recycled (process restarted) after
+    `max_requests` leases or `max_age` seconds. Failed spawns are retried with
+    backoff up to `max_respawn_attempts` times; a lease waits at most
+    `lease_timeout` seconds. Use as an async context manager:
+
+        async with ServerPool(size=4) as pool:
+            async with pool.lease() as session:
+                await call_echo_tool(session, "hi")
+    """
+
+    def __init__(self, size: int = 4, server_params: StdioServerParameters | None = None,
+                 max_requests: int = 1000, max_age: float = 300.0, health_check_interval: float = 30.0,
+                 respawn_delay: float = 1.0, max_respawn_attempts: int = 5, lease_timeout: float | None = 30.0):
+        if size < 1:
+            raise ValueError(f"Pool size must be at least 1, got {size}.")
+        self.size = size
+        self.server_params = server_params or StdioServerParameters(
+            command=sys.executable, args=["mcp_server.py"], cwd=os.path.dirname(os.path.abspath(__file__))
+        )
+        self.max_requests = max_requests
+        self.max_age = max_age
+        self.health_check_interval = health_check_interval
+        self.respawn_delay = respawn_delay
+        self.max_respawn_attempts = max_respawn_attempts
+        self.lease_timeout = lease_timeout
+        self._idle: asyncio.Queue[_PooledServer | _SpawnFailure] = asyncio.Queue()
+        self._members: set[_PooledServer] = set()
+        self._spawning: set[asyncio.Task] = set()
+        self._closed = False
+        self._last_spawn_error: BaseException | None = None
+        self.leases = 0
+        self.spawned = 0
+        self.recycled = 0
+        self.health_check_failures = 0
+        self.spawn_failures = 0
+
+    async def start(self) -> None:
+        """Spawns and initializes all pooled servers concurrently."""
+        members = [_PooledServer(self.server_params) for _ in range(self.size)]
+        try:
+            results = await asyncio.gather(*(m.wait_ready() for m in members), return_exceptions=True)
+        except BaseException:
+            await asyncio.shield(asyncio.gather(*(m.close() for m in members), return_exceptions=True))
+            raise
+        for member, result in zip(members, results):
+            if isinstance(result, BaseException):
+                await member.close()
+                self._last_spawn_error = result
+                print(f"[CLIENT_LOG] Failed to start pooled server: {result}", file=sys.stderr, flush=True)
+                self._respawn_later()
+            else:
+                self._members.add(member)
+                self.spawned += 1
+                self._idle.put_nowait(member)
+
+    async def close(self) -> None:
+        self._closed = True
+        for task in self._spawning:
+            task.cancel()
+        await asyncio.gather(*self._spawning, return_exceptions=True)
+        await asyncio.gather(*(m.close() for m in self._members), return_exceptions=True)
+        self._members.clear()
+
+    async def __aenter__(self) -> "ServerPool":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    def stats(self) -> dict:
+        return {
+            "size": self.size,
+            "idle": self._idle.qsize(),
+            "leased": len(self._members) - self._idle.qsize(),
+            "spawning": len(self._spawning),
+            "leases": self.leases,
+            "spawned": self.spawned,
+            "recycled": self.recycled,
+            "health_check_failures": self.health_check_failures,
+            "spawn_failures": self.spawn_failures,
+        }
+
+    def _is_expired(self, member: _PooledServer) -> bool:
+        return member.requests >= self.max_requests or time.monotonic() - member.created_at >= self.max_age
+
+    async def _is_healthy(self, member: _PooledServer) -> bool:
+        if member._task.done():
+            return False
+        if time.monotonic() - member.last_used < self.health_check_interval:
+            return True
+        try:
+            await asyncio.wait_for(member.session.send_ping(), timeout=5)
+            return True
+        except Exception:
+            self.health_check_failures += 1
+            return False
+
+    async def _spawn_replacement(self) -> None:
+        # Retries with exponential backoff; after max_respawn_attempts the slot is handed
+        # to the next waiter as a failure, which raises the spawn error and retries again.
+        for attempt in range(self.max_respawn_attempts):
+            if self._closed:
+                return
+            member = _PooledServer(self.server_params)
+            try:
+                await member.wait_ready()
+            except asyncio.CancelledError:
+                # close() cancelled this respawn: the member is in neither _members nor _idle,
+                # so shut its process down here.
+                await asyncio.shield(member.close())
+                raise
+            except Exception as e:
+                await member.close()
+                self._last_spawn_error = e
+                print(f"[CLIENT_LOG] Failed to respawn pooled server (attempt {attempt + 1}/{self.max_respawn_attempts}): {e}",
+                      file=sys.stderr, flush=True)
+                if attempt + 1 < self.max_respawn_attempts:
+                    await asyncio.sleep(self.respawn_delay * 2 ** attempt)
+                continue
+            self._members.add(member)
+            self.spawned += 1
+            self._idle.put_nowait(member)
+            return
+        if not self._closed:
+            self.spawn_failures += 1
+            self._idle.put_nowait(_SpawnFailure(self._last_spawn_error))
+
+    def _respawn_later(self) -> None:
+        task = asyncio.create_task(self._spawn_replacement())
+        self._spawning.add(task)
+        task.add_done_callback(self._spawning.discard)
+
+    async def _recycle(self, member: _PooledServer) -> None:
+        self._members.discard(member)
+        self.recycled += 1
+        await member.close()
+        if not self._closed:
+            self._respawn_later()
+
+    async def _next_idle(self) -> "_PooledServer | _SpawnFailure":
+        try:
+            return await asyncio.wait_for(self._idle.get(), timeout=self.lease_timeout)
+        except asyncio.TimeoutError:
+            raise TimeoutError(f"No pooled server became available within {self.lease_timeout} seconds.") from self._last_spawn_error
+
+    @asynccontextmanager
+    async def lease(self) -> AsyncIterator[ClientSession]:
+        """Leases a warm, initialized session; it returns to the pool on exit.
+
+        Waits at most `lease_timeout` seconds for a free server (raising
+        `TimeoutError`), and raises `RuntimeError` if the server it was due
+        could not be respawned.
+        """
+        if self._closed:
+            raise RuntimeError("ServerPool is closed.")
+        while True:
+            member = await self._next_idle()
+            if isinstance(member, _SpawnFailure):
+                self._respawn_later()
+                raise RuntimeError(f"Pooled server could not be started: {member.error}") from member.error
+            if self._is_expired(member) or not await self._is_healthy(member):
+                await self._recycle(member)
+                continue
+            break
+        self.leases += 1
+        failed = False
+        try:
+            yield member.session
+        except Exception:
+            failed = True
+            raise
+        finally:
+            member.requests += 1
+            member.last_used = time.monotonic()
+            if failed:
+                # Force a ping on the next lease before handing this server out again.
+                member.last_used = 0.0
+            if not self._closed:
+                if self._is_expired(member) or member._task.done():
+                    await self._recycle(member)
+                else:
+                    self._idle.put_nowait(member)
+
+
 async def main():
     server_executable = sys.executable # Changed variable name
     server_args = ["mcp_server.py"]      # Changed variable name
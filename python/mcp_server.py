@@ -1,75 +1,128 @@
+import time
+_IMPORT_STARTED = time.perf_counter() # Startup report: everything below counts as import time
 import asyncio
 import os
 import json
-import base64
 import random # Added random
+import sys
+import weakref
+import functools
+import inspect
+from functools import cache
 from contextlib import asynccontextmanager
 from enum import Enum
+import anyio
 from mcp.server.fast_mcp import FastMCP, Context
 from mcp.messages import UserMessage, TextContent, ImageContent, AssistantMessage
-from .constants import MCP_TINY_IMAGE
+from admission import AdmissionController
+from batch import encode_batch_results, run_batch
+from completion_index import CompletionRegistry, IntegerRangeSource
+from env_snapshot import EnvironmentSnapshot
+from file_resources import FILE_RESOURCE_DIR_ENV_VAR, FILE_RESOURCE_URI_PREFIX, FileResourceProvider
+from log_pipeline import LOG_LEVEL_THRESHOLDS, LogPipeline
+from metrics import MetricsRegistry
+from notification_engine import ResourceUpdateNotifier
+from progress import ProgressReporter, progress_setting_from_env
+from records import AnnotationTemplate, PromptArgument, PromptRecord, ResourceRecord
+from result_cache import ResultCache
+from resource_store import ResourceStore, STATIC_RESOURCE_URI_PREFIX, resource_count_from_env
+from scheduler import Job, TimerWheel
+from single_flight import SingleFlight
+# constants (MCP_TINY_IMAGE) and profiling are imported on first use; see tiny_image() and the profiling tools.
 # import mcp # For mcp.run() # Removed as per instructions
 
+# Startup report (milliseconds): module imports, create_server() and process start to lifespan entry.
+# Set MCP_STARTUP_REPORT=1 to print it to stderr once the server is ready; it is also in the metrics.
+STARTUP_REPORT_ENV_VAR = "MCP_STARTUP_REPORT"
+STARTUP_TIMINGS: dict[str, float] = {"import_ms": (time.perf_counter() - _IMPORT_STARTED) * 1000}
+
 # Define PromptName Enum at module level
 class PromptName(Enum):
     SIMPLE = "simple_prompt"
     COMPLEX = "complex_prompt"
 
-# ALL_RESOURCES constant
-ALL_RESOURCES = [
-    {
-        "uri": "test://static/resource/1",
-        "name": "Resource 1",
-        "mime_type": "text/plain",
-        "text": "Resource 1: This is a plaintext resource"
-    },
-    {
-        "uri": "test://static/resource/2",
-        "name": "Resource 2",
-        "mime_type": "application/octet-stream",
-        "blob": base64.b64encode(b"Resource 2: This is a base64 blob").decode('utf-8')
-    },
-    {
-        "uri": "test://static/resource/3",
-        "name": "Resource 3 - Another Text",
-        "mime_type": "text/plain",
-        "text": "Resource 3: More plaintext content here."
-    },
-    {
-        "uri": "test://static/resource/4",
-        "name": "Resource 4 - Image (Fake)",
-        "mime_type": "image/png",
-        "blob": base64.b64encode(b"Fake PNG data").decode('utf-8')
-    },
-    {
-        "uri": "test://static/resource/5",
-        "name": "Resource 5 - JSON Data",
-        "mime_type": "application/json",
-        "text": json.dumps({"key": "value", "number": 123})
-    },
-    {
-        "uri": "test://static/resource/6",
-        "name": "Resource 6 - Long Text",
-        "mime_type": "text/plain",
-        "text": "This is resource number six, and it has a slightly longer description to see how text wrapping or truncation might be handled by a client."
-    },
-    {
-        "uri": "test://static/resource/7",
-        "name": "Resource 7 - Another Blob",
-        "mime_type": "application/octet-stream",
-        "blob": base64.b64encode(b"Yet another piece of binary data for Resource 7").decode('utf-8')
-    }
-]
+# Static resource definitions as immutable records. Blob payloads stay raw bytes until
+# the first read, which base64-encodes them once into the record.
+RESOURCE_DEFINITIONS = (
+    ResourceRecord("test://static/resource/1", "Resource 1", "text/plain",
+                   text="Resource 1: This is a plaintext resource"),
+    ResourceRecord("test://static/resource/2", "Resource 2", "application/octet-stream",
+                   blob=b"Resource 2: This is a base64 blob"),
+    ResourceRecord("test://static/resource/3", "Resource 3 - Another Text", "text/plain",
+                   text="Resource 3: More plaintext content here."),
+    ResourceRecord("test://static/resource/4", "Resource 4 - Image (Fake)", "image/png",
+                   blob=b"Fake PNG data"),
+    ResourceRecord("test://static/resource/5", "Resource 5 - JSON Data", "application/json",
+                   text='{"key": "value", "number": 123}'),
+    ResourceRecord("test://static/resource/6", "Resource 6 - Long Text", "text/plain",
+                   text="This is resource number six, and it has a slightly longer description to see how text wrapping or truncation might be handled by a client."),
+    ResourceRecord("test://static/resource/7", "Resource 7 - Another Blob", "application/octet-stream",
+                   blob=b"Yet another piece of binary data for Resource 7"),
+)
+
+def all_resources() -> list[dict]:
+    """The static resources in wire form; each call returns new dicts that callers own."""
+    return [record.wire() for record in RESOURCE_DEFINITIONS]
+
+# Prompt definitions; list_prompts hands out copies of their pre-rendered wire forms.
+PROMPTS = (
+    PromptRecord(PromptName.SIMPLE.value, "A prompt without arguments"),
+    PromptRecord(PromptName.COMPLEX.value, "A prompt with arguments", (
+        PromptArgument("temperature", "Temperature setting", required=True),
+        PromptArgument("style", "Output style", required=False),
+    )),
+)
+
+# annotated_message templates by message type; unknown types use the fallback with the type filled in.
+ANNOTATION_TEMPLATES = {
+    "error": AnnotationTemplate("Error: Operation failed", 1.0, ("user", "assistant")),
+    "success": AnnotationTemplate("Operation completed successfully", 0.7, ("user",)),
+    "debug": AnnotationTemplate("Debug: Cache hit ratio 0.95, latency 150ms", 0.3, ("assistant",)),
+}
+UNKNOWN_ANNOTATION_TEMPLATE = AnnotationTemplate("Unknown message type: {message_type}", 0.5, ("user", "assistant"))
+IMAGE_ANNOTATION_TEMPLATE = AnnotationTemplate("", 0.5, ("user",))
+
+@cache
+def tiny_image() -> str:
+    """Returns constants.MCP_TINY_IMAGE, importing it on first use so start-up does not load the payload."""
+    from constants import MCP_TINY_IMAGE
+    return MCP_TINY_IMAGE
+
+def __getattr__(name: str):
+    # ALL_RESOURCES is still available as a module attribute, built lazily.
+    if name == "ALL_RESOURCES":
+        return all_resources()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 # EXAMPLE_COMPLETIONS constant
 EXAMPLE_COMPLETIONS = {
     "style": ["casual", "formal", "technical", "friendly"],
     "temperature": ["0", "0.5", "0.7", "1.0"],
-    "resourceId": ["1", "2", "3", "4", "5"], 
 }
 
+# Subscribed resources are marked updated every interval, spread by up to the given jitter.
+RESOURCE_UPDATE_INTERVAL = 5
+RESOURCE_UPDATE_JITTER = 0.5
+
+# Metrics export settings: set MCP_METRICS_FILE to dump Prometheus text on an interval.
+METRICS_FILE_ENV_VAR = "MCP_METRICS_FILE"
+METRICS_INTERVAL_ENV_VAR = "MCP_METRICS_INTERVAL"
+
+# Progress notification throttling: minimum seconds and minimum fraction of the total between notifications.
+PROGRESS_MIN_INTERVAL_ENV_VAR = "MCP_PROGRESS_MIN_INTERVAL"
+PROGRESS_MIN_DELTA_ENV_VAR = "MCP_PROGRESS_MIN_DELTA"
+
+# Admission control: server-wide cap on concurrent limited calls, and how long a call may wait for a slot.
+MAX_CONCURRENT_CALLS_ENV_VAR = "MCP_MAX_CONCURRENT_CALLS"
+ADMISSION_TIMEOUT_ENV_VAR = "MCP_ADMISSION_TIMEOUT"
+
 # Logging constants and helper
-LOG_LEVEL_ORDER = ["debug", "info", "notice", "warning", "error", "critical", "alert", "emergency"]
+# Rate of the synthetic log generator (messages per second) and the pipeline's send cap.
+LOG_EMIT_RATE_ENV_VAR = "MCP_LOG_EMIT_RATE"
+LOG_MAX_RATE_ENV_VAR = "MCP_LOG_MAX_RATE"
+LOG_BUFFER_ENV_VAR = "MCP_LOG_BUFFER"
+DEFAULT_LOG_EMIT_RATE = 1 / 15 # One message every 15 seconds
+DEFAULT_LOG_LEVEL = "debug" # Level of every session until it sets its own
 LOG_MESSAGES = [
     {"level": "debug", "data": "This is a debug message: Variable x = 10"},
     {"level": "info", "data": "Service started successfully on port 8080."},
@@ -82,61 +135,160 @@ LOG_MESSAGES = [
 ]
 
 def is_message_ignored(current_level_str: str, message_level_str: str) -> bool:
-    try:
-        current_idx = LOG_LEVEL_ORDER.index(current_level_str.lower())
-        message_idx = LOG_LEVEL_ORDER.index(message_level_str.lower())
-        return message_idx < current_idx
-    except ValueError: 
-        return True 
-
-async def main():
-    # Initialization for subscriptions and periodic task
-    subscriptions: set[str] = set()
+    current_idx = LOG_LEVEL_THRESHOLDS.get(current_level_str.lower())
+    message_idx = LOG_LEVEL_THRESHOLDS.get(message_level_str.lower())
+    if current_idx is None or message_idx is None:
+        return True
+    return message_idx < current_idx
+
+def create_server() -> FastMCP:
+    """Builds the fully registered server without attaching it to a transport.
+
+    `main()` runs the result over stdio; tests and benchmarks can instead attach
+    it to an in-memory stream pair (see `mcp_client.connect_in_process`).
+    """
+    setup_started = time.perf_counter()
+
+    # One timer wheel hosts every periodic job (subscription cadences, log bursts, metrics export)
+    scheduler = TimerWheel()
+    scheduler_task: asyncio.Task | None = None
+
+    # Initialization for subscriptions; each subscribed URI gets its own scheduler job.
+    # Subscriptions are per session: the notifier's targets are (session, uri) pairs.
+    resource_notifier = ResourceUpdateNotifier(interval=0)
+    subscription_jobs: dict[str, Job] = {}
+    subscribers: dict[str, set] = {}
     subs_update_interval_task: asyncio.Task | None = None
-    
-    # Initialization for logging
-    log_level: str = "debug" # Default log level
-    logs_update_interval_task: asyncio.Task | None = None
 
+    # Initialization for metrics
+    metrics = MetricsRegistry()
+    metrics.register_collector("resource_notifier", resource_notifier.stats)
+    metrics.register_collector("scheduler", scheduler.stats)
+    metrics.register_collector("startup", lambda: dict(STARTUP_TIMINGS))
 
-    # Periodic resource update notification function
-    async def notify_resource_updates(server_ref: FastMCP):
-        while True:
-            await asyncio.sleep(5)
-            for uri in list(subscriptions):
-                try:
-                    await server_ref.notify_resource_updated(uri)
-                except Exception as e:
-                    pass 
+    # Opt-in (MCP_RESULT_CACHE=1) LRU cache for handlers declared pure
+    result_cache = ResultCache.from_env()
+    metrics.register_collector("result_cache", result_cache.stats)
 
-    # Periodic log message notification function
-    async def notify_log_messages(server_ref: FastMCP):
-        nonlocal log_level # To access the current log_level from main's scope
-        while True:
-            await asyncio.sleep(15) # 15-second interval
+    # Per-tool and global concurrency limits; over-limit calls queue briefly, then fail fast
+    admission = AdmissionController(
+        global_limit=int(os.environ.get(MAX_CONCURRENT_CALLS_ENV_VAR, "32")),
+        timeout=float(os.environ.get(ADMISSION_TIMEOUT_ENV_VAR, "30")),
+    )
+    metrics.register_collector("admission", admission.stats)
+
+    # Throttle for long_running_operation progress notifications; invalid settings fail here, not per call
+    progress_min_interval = progress_setting_from_env(PROGRESS_MIN_INTERVAL_ENV_VAR, 0.1)
+    progress_min_delta = progress_setting_from_env(PROGRESS_MIN_DELTA_ENV_VAR, 0.01)
+
+    # sample_llm round-trips: timeouts always; sharing identical in-flight prompts and a short TTL cache are opt-in
+    sampling_flights = SingleFlight.from_env()
+    metrics.register_collector("sampling", sampling_flights.stats)
+    
+    # Initialization for logging
+    log_pipeline = LogPipeline(
+        level=DEFAULT_LOG_LEVEL,
+        capacity=int(os.environ.get(LOG_BUFFER_ENV_VAR, "1024")),
+        max_rate=float(os.environ.get(LOG_MAX_RATE_ENV_VAR, "1000")),
+    )
+    log_emit_rate = float(os.environ.get(LOG_EMIT_RATE_ENV_VAR, str(DEFAULT_LOG_EMIT_RATE)))
+    metrics.register_collector("log_pipeline", log_pipeline.stats)
+    log_pipeline_task: asyncio.Task | None = None
+    log_emit_last: float | None = None
+    log_emit_due = 0.0
+    # Log levels are per session; the pipeline buffers at the lowest level any session asked for.
+    # Every session that makes a request is tracked, at DEFAULT_LOG_LEVEL until it sets its own.
+    session_log_levels: "weakref.WeakKeyDictionary[object, str]" = weakref.WeakKeyDictionary()
+
+    def refresh_log_level() -> None:
+        if session_log_levels:
+            log_pipeline.set_level(min(session_log_levels.values(), key=LOG_LEVEL_THRESHOLDS.__getitem__))
+
+    def register_session(ctx: Context | None) -> None:
+        if ctx is not None and ctx.session not in session_log_levels:
+            session_log_levels[ctx.session] = DEFAULT_LOG_LEVEL
+            refresh_log_level()
+
+    def track_session(func):
+        """Registers the requesting session (from the injected `ctx`) the first time it is seen."""
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                register_session(kwargs.get("ctx"))
+                return await func(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            register_session(kwargs.get("ctx"))
+            return func(*args, **kwargs)
+        return wrapper
+
+    def drop_session(session) -> None:
+        if session_log_levels.pop(session, None):
+            refresh_log_level()
+        for uri in [uri for uri, sessions in subscribers.items() if session in sessions]:
+            remove_subscription(session, uri)
+
+    async def send_resource_update(target: tuple) -> None:
+        session, uri = target
+        try:
+            await session.send_resource_updated(uri)
+        except (anyio.ClosedResourceError, anyio.BrokenResourceError):
+            drop_session(session)
+            raise
+
+    async def send_log_message(level: str, data: object, logger: str) -> int:
+        delivered = 0
+        for session, session_level in list(session_log_levels.items()):
+            if is_message_ignored(session_level, level):
+                continue
+            try:
+                await session.send_log_message(level=level, data=data, logger=logger)
+                delivered += 1
+            except (anyio.ClosedResourceError, anyio.BrokenResourceError):
+                drop_session(session)
+        return delivered
+
+
+    # Periodic log message generator (a scheduler job); the pipeline filters, buffers and rate-limits sending
+    def notify_log_messages():
+        nonlocal log_emit_last, log_emit_due
+        now = asyncio.get_running_loop().time()
+        if log_emit_last is not None:
+            log_emit_due += (now - log_emit_last) * log_emit_rate
+        log_emit_last = now
+        for _ in range(int(log_emit_due)):
             random_message = random.choice(LOG_MESSAGES)
-            if not is_message_ignored(log_level, random_message["level"]):
-                try:
-                    await server_ref.notify_message(
-                        level=random_message["level"],
-                        data=random_message["data"],
-                        logger="python-mcp-server" 
-                    )
-                except Exception as e:
-                    # Potentially log this error to stderr or a file if server_ref.notify_message fails
-                    print(f"Error sending log message: {e}")
+            log_pipeline.submit(random_message["level"], random_message["data"])
+        log_emit_due -= int(log_emit_due)
 
 
     # Lifespan context manager
     @asynccontextmanager
     async def app_lifespan(app: FastMCP):
-        nonlocal subs_update_interval_task, logs_update_interval_task
+        nonlocal scheduler_task, subs_update_interval_task, log_pipeline_task
         print("[SERVER_LOG][LIFESPAN] Startup: Entered app_lifespan.", flush=True)
         
         # Startup
-        subs_update_interval_task = asyncio.create_task(notify_resource_updates(app))
-        logs_update_interval_task = asyncio.create_task(notify_log_messages(app))
+        subs_update_interval_task = asyncio.create_task(resource_notifier.run(
+            metrics.instrument("notification", "resources/updated")(send_resource_update)))
+        log_pipeline_task = asyncio.create_task(log_pipeline.run(
+            metrics.instrument("notification", "message")(send_log_message)))
+        if log_emit_rate > 0:
+            # Wake at most 100 times per second and emit however many messages are due.
+            scheduler.call_every(max(1 / log_emit_rate, 0.01), notify_log_messages, name="log-messages", first_delay=0)
+        metrics_file = os.environ.get(METRICS_FILE_ENV_VAR)
+        if metrics_file:
+            metrics_interval = float(os.environ.get(METRICS_INTERVAL_ENV_VAR, "15"))
+            scheduler.call_every(metrics_interval, lambda: metrics.write_prometheus(metrics_file), name="metrics-export")
+        scheduler_task = asyncio.create_task(scheduler.run())
         print("[SERVER_LOG][LIFESPAN] Startup: Background tasks created.", flush=True)
+        if "ready_ms" not in STARTUP_TIMINGS:
+            STARTUP_TIMINGS["ready_ms"] = (time.perf_counter() - _IMPORT_STARTED) * 1000
+            if os.environ.get(STARTUP_REPORT_ENV_VAR):
+                report = ", ".join(f"{key}={value:.1f}" for key, value in STARTUP_TIMINGS.items())
+                print(f"[SERVER_LOG] Startup report: {report}", file=sys.stderr, flush=True)
         
         try:
             yield
@@ -144,17 +296,24 @@ async def main():
         finally:
             print("[SERVER_LOG][LIFESPAN] Shutdown: Entered finally block.", flush=True)
             # Shutdown
+            for job in list(scheduler.jobs):
+                job.cancel()
             tasks_to_cancel = []
+            if scheduler_task:
+                scheduler_task.cancel()
+                tasks_to_cancel.append(scheduler_task)
             if subs_update_interval_task:
                 subs_update_interval_task.cancel()
                 tasks_to_cancel.append(subs_update_interval_task)
-            if logs_update_interval_task:
-                logs_update_interval_task.cancel()
-                tasks_to_cancel.append(logs_update_interval_task)
+            if log_pipeline_task:
+                log_pipeline_task.cancel()
+                tasks_to_cancel.append(log_pipeline_task)
             
             if tasks_to_cancel:
                 await asyncio.gather(*tasks_to_cancel, return_exceptions=True)
                 print("[SERVER_LOG][LIFESPAN] Shutdown: Background tasks gathered.", flush=True)
+            print(f"[SERVER_LOG][LIFESPAN] Shutdown: Resource notifier stats: {resource_notifier.stats()}", flush=True)
+            print(f"[SERVER_LOG][LIFESPAN] Shutdown: Scheduler stats: {scheduler.stats()}", flush=True)
             print("[SERVER_LOG][LIFESPAN] Shutdown: app_lifespan cleanup complete.", flush=True)
 
 
@@ -171,49 +330,118 @@ async def main():
 
     # --- Logging Control Handler ---
     @server.set_logging_level_handler()
+    @metrics.instrument("logging")
+    @track_session
     async def set_logging_level_handler(level: str, ctx: Context) -> None:
-        nonlocal log_level
-        log_level = level.lower() # Normalize to lower case
+        level = level.lower()
+        if level not in LOG_LEVEL_THRESHOLDS:
+            raise ValueError(f"Unknown log level: {level}")
+        session_log_levels[ctx.session] = level
+        refresh_log_level() # Takes effect for already buffered messages too
         # Notify client about the change. Using "info" level for this notification itself.
         await ctx.notify_message(
             level="info", 
-            data=f"Logging level set to: {log_level}", 
+            data=f"Logging level set to: {level}", 
             logger="python-mcp-server"
         )
 
     # Echo tool
     @server.tool()
-    def echo(message: str) -> str:
+    @metrics.instrument("tool")
+    @track_session
+    @result_cache.pure()
+    def echo(message: str, ctx: Context = None) -> str:
         return f"Echo: {message}"
 
     # Add tool
     @server.tool()
-    def add(a: int, b: int) -> str:
+    @metrics.instrument("tool")
+    @track_session
+    @result_cache.pure()
+    def add(a: int, b: int, ctx: Context = None) -> str:
         return f"The sum of {a} and {b} is {a + b}."
 
     # LongRunningOperation tool
     @server.tool()
+    @metrics.instrument("tool")
+    @track_session
+    @admission.limited(limit=8, max_queue=32)
     async def long_running_operation(duration: int = 10, steps: int = 5, ctx: Context = None) -> str:
+        async def send_progress(current: int, total: int) -> None:
+            if ctx:
+                await ctx.report_progress(current_step=current, total_steps=total)
+
+        # A negative step count runs no steps and just reports completion.
+        progress = ProgressReporter(send_progress, max(steps, 0), min_interval=progress_min_interval, min_delta=progress_min_delta)
+        loop = asyncio.get_running_loop()
+        started = loop.time()
         for i in range(steps):
-            await asyncio.sleep(duration / steps)
-            if ctx: 
-                await ctx.report_progress(current_step=i + 1, total_steps=steps)
+            # Sleep to each step's deadline rather than a fixed delay, so many tiny steps do not drift.
+            await asyncio.sleep(max(0.0, started + duration * (i + 1) / steps - loop.time()))
+            await progress.update(i + 1)
+            if progress.cancelled:
+                return f"Long running operation cancelled after {i + 1} of {steps} steps."
+        await progress.finish()
         return f"Long running operation completed. Duration: {duration} seconds, Steps: {steps}."
 
-    # PrintEnv tool
+    # PrintEnv tool: encodings are cached until the environment changes
+    environment = EnvironmentSnapshot()
+    metrics.register_collector("environment", environment.stats)
+
     @server.tool()
-    def print_env() -> str:
-        return json.dumps(dict(os.environ), indent=2)
+    @metrics.instrument("tool")
+    @track_session
+    def print_env(prefix: str | None = None, pattern: str | None = None, compact: bool = False, ctx: Context = None) -> str:
+        return environment.encode(prefix=prefix, pattern=pattern, compact=compact)
+
+    # Profiling admin tools: bounded cProfile/tracemalloc capture on the live loop.
+    # The session (and the cProfile/pstats/tracemalloc imports) is created on first use.
+    profiler = None
+
+    def get_profiler():
+        nonlocal profiler
+        if profiler is None:
+            from profiling import ProfilingSession
+            profiler = ProfilingSession()
+        return profiler
+
+    @server.tool()
+    @metrics.instrument("tool")
+    @track_session
+    async def start_profiling(duration: int = 30, cpu: bool = True, memory: bool = True, ctx: Context = None) -> str:
+        session = get_profiler()
+        session.start(duration, cpu=cpu, memory=memory)
+        return f"Profiling started for up to {duration} seconds (cpu={cpu}, memory={memory}). Output directory: {session.output_dir}"
+
+    @server.tool()
+    @metrics.instrument("tool")
+    @track_session
+    async def stop_profiling(ctx: Context = None) -> str:
+        session = get_profiler()
+        report = session.stop()
+        return f"Profiling stopped. Report written to {session.latest_report_path}\n\n{report}"
 
     # SampleLLM tool
+    # Admission is taken inside the shared flight, so identical concurrent prompts use one slot.
+    @admission.limited(limit=4, max_queue=16, name="sample_llm")
+    async def request_sample(ctx: Context, prompt: str, max_tokens: int):
+        return await ctx.create_message(
+            messages=[UserMessage(content=TextContent(text=prompt))],
+            max_tokens=max_tokens
+        )
+
     @server.tool()
+    @metrics.instrument("tool")
+    @track_session
     async def sample_llm(prompt: str, max_tokens: int = 100, ctx: Context = None) -> str:
         if not ctx:
             return "Error: Context not available for LLM sampling."
-        response_message = await ctx.create_message(
-            messages=[UserMessage(content=TextContent(text=prompt))],
-            max_tokens=max_tokens
-        )
+        try:
+            # Keyed by session too: flights and cached responses are never shared between clients.
+            response_message = await sampling_flights.do((ctx.session, prompt, max_tokens),
+                                                         lambda: request_sample(ctx, prompt, max_tokens))
+        except TimeoutError:
+            return f"Error: LLM sampling timed out after {sampling_flights.timeout} seconds."
         if response_message and hasattr(response_message, 'content') and hasattr(response_message.content, 'text'):
             result_text = response_message.content.text
             return f"LLM sampling result: {result_text}"
@@ -222,106 +450,237 @@ async def main():
 
     # GetTinyImage tool
     @server.tool()
-    def get_tiny_image() -> list:
+    @metrics.instrument("tool")
+    @track_session
+    @result_cache.pure()
+    def get_tiny_image(ctx: Context = None) -> list:
         return [
             TextContent(text="This is a tiny image:"),
-            ImageContent(data=MCP_TINY_IMAGE, mime_type="image/png"),
+            ImageContent(data=tiny_image(), mime_type="image/png"),
             TextContent(text="The image above is the MCP tiny image.")
         ]
 
-    # AnnotatedMessage tool
-    @server.tool()
-    def annotated_message(message_type: str, include_image: bool = False) -> list:
-        content_parts = []
-        if message_type == "error":
-            content_parts.append(TextContent(
-                text="Error: Operation failed",
-                annotations={"priority": 1.0, "audience": ["user", "assistant"]}
-            ))
-        elif message_type == "success":
-            content_parts.append(TextContent(
-                text="Operation completed successfully",
-                annotations={"priority": 0.7, "audience": ["user"]}
-            ))
-        elif message_type == "debug":
-            content_parts.append(TextContent(
-                text="Debug: Cache hit ratio 0.95, latency 150ms",
-                annotations={"priority": 0.3, "audience": ["assistant"]}
-            ))
-        else:
-            content_parts.append(TextContent(
-                text=f"Unknown message type: {message_type}",
-                annotations={"priority": 0.5, "audience": ["user", "assistant"]}
-            ))
+    # AnnotatedMessage tool: parts are built per call from the message type's pre-rendered template
+    def render_annotated_parts(text: str, template: AnnotationTemplate, include_image: bool) -> list:
+        content_parts = [TextContent(text=text, annotations=template.annotations)]
         if include_image:
             content_parts.append(ImageContent(
-                data=MCP_TINY_IMAGE,
+                data=tiny_image(),
                 mime_type="image/png",
-                annotations={"priority": 0.5, "audience": ["user"]}
+                annotations=IMAGE_ANNOTATION_TEMPLATE.annotations
             ))
         return content_parts
 
+    @server.tool()
+    @metrics.instrument("tool")
+    @track_session
+    @result_cache.pure()
+    def annotated_message(message_type: str, include_image: bool = False, ctx: Context = None) -> list:
+        template = ANNOTATION_TEMPLATES.get(message_type)
+        if template is None:
+            return render_annotated_parts(UNKNOWN_ANNOTATION_TEMPLATE.text.format(message_type=message_type),
+                                          UNKNOWN_ANNOTATION_TEMPLATE, include_image)
+        return render_annotated_parts(template.text, template, include_image)
+
+    # Batch tool: runs many sub-calls in one request. Each sub-call goes through the server's own
+    # call_tool path, so argument validation, metrics, caching and admission limits apply per sub-call.
+    # long_running_operation is left out: its progress would share the batch request's progress token.
+    batchable_tools = {fn.__name__: fn for fn in (
+        echo, add, print_env, sample_llm, get_tiny_image, annotated_message,
+    )}
+
+    @server.tool()
+    @metrics.instrument("tool")
+    @track_session
+    async def batch(calls: list[dict], max_concurrency: int = 16, ctx: Context = None) -> str:
+        results = await run_batch(batchable_tools, calls, server.call_tool, max_concurrency=max_concurrency)
+        return encode_batch_results(results)
+
     # --- Resource Listing Logic ---
     PAGE_SIZE_RESOURCES = 10 
+    # Indexed, lazily generated catalog; the static definitions seed the first ids.
+    resource_store = ResourceStore(resource_count_from_env(default=len(RESOURCE_DEFINITIONS)), fixed=RESOURCE_DEFINITIONS)
+
+    @metrics.instrument("resource")
+    @track_session
     async def list_all_static_resources(cursor: str | None = None, page_size: int = PAGE_SIZE_RESOURCES, ctx: Context = None) -> tuple[list[dict], str | None]:
-        start_index = 0
-        if cursor:
-            try:
-                decoded_cursor = int(base64.b64decode(cursor).decode('utf-8'))
-                start_index = decoded_cursor 
-            except Exception as e:
-                if ctx and hasattr(ctx, 'error'): 
-                    await ctx.error(f"Invalid cursor format received: {cursor}. Error: {e}")
-                start_index = 0
         actual_page_size = page_size if page_size > 0 else PAGE_SIZE_RESOURCES
-        end_index = min(start_index + actual_page_size, len(ALL_RESOURCES))
-        resources_page = ALL_RESOURCES[start_index:end_index]
-        next_cursor_val = None
-        if end_index < len(ALL_RESOURCES):
-            next_cursor_val = base64.b64encode(str(end_index).encode('utf-8')).decode('utf-8')
-        return resources_page, next_cursor_val
-    server.set_list_resources_handler(list_all_static_resources, prefix="test://static/resource/")
+        try:
+            # Cursors pin the catalog snapshot the listing started from.
+            return resource_store.list_page(cursor, actual_page_size)
+        except Exception as e:
+            if ctx and hasattr(ctx, 'error'): 
+                await ctx.error(f"Invalid cursor format received: {cursor}. Error: {e}")
+            return resource_store.list_page(None, actual_page_size)
+    server.set_list_resources_handler(list_all_static_resources, prefix=STATIC_RESOURCE_URI_PREFIX)
 
     @server.resource("test://static/resource/{resource_id}")
+    @metrics.instrument("resource")
+    @track_session
     async def get_static_resource(resource_id: str, ctx: Context = None) -> dict:
-        uri_to_find = f"test://static/resource/{resource_id}"
-        resource = next((r for r in ALL_RESOURCES if r["uri"] == uri_to_find), None)
+        resource = resource_store.get(resource_id)
         if resource:
             return resource
         else:
             raise ValueError(f"Resource with ID {resource_id} not found.")
 
+    # Catalog version, and the delta since a version, so clients can poll without re-listing.
+    @server.resource("test://static/catalog")
+    @metrics.instrument("resource")
+    @track_session
+    async def get_static_catalog(ctx: Context = None) -> dict:
+        return {
+            "uri": "test://static/catalog",
+            "name": "Static Resource Catalog",
+            "mime_type": "application/json",
+            "text": json.dumps({"version": resource_store.version, "count": resource_store.count})
+        }
+
+    @server.resource("test://static/changes/{since_version}")
+    @metrics.instrument("resource")
+    @track_session
+    async def get_static_changes(since_version: str, ctx: Context = None) -> dict:
+        if not since_version.isdigit():
+            raise ValueError(f"Version must be a non-negative integer, got {since_version!r}.")
+        return {
+            "uri": f"test://static/changes/{since_version}",
+            "name": f"Static Resource Changes since {since_version}",
+            "mime_type": "application/json",
+            "text": json.dumps(resource_store.changes_since(int(since_version)))
+        }
+
+    # --- File-backed Resources (enabled by MCP_FILE_RESOURCE_DIR) ---
+    # The mmap reads and base64 encoding run in worker threads to keep the event loop free.
+    file_resource_dir = os.environ.get(FILE_RESOURCE_DIR_ENV_VAR)
+    file_provider = FileResourceProvider(file_resource_dir) if file_resource_dir else None
+
+    if file_provider:
+        @metrics.instrument("resource")
+        @track_session
+        async def list_file_resources(cursor: str | None = None, page_size: int = PAGE_SIZE_RESOURCES, ctx: Context = None) -> tuple[list[dict], str | None]:
+            start_index = 0
+            if cursor:
+                try:
+                    start_index = ResourceStore.decode_cursor(cursor)
+                except Exception as e:
+                    if ctx and hasattr(ctx, 'error'): 
+                        await ctx.error(f"Invalid cursor format received: {cursor}. Error: {e}")
+                    start_index = 0
+            actual_page_size = page_size if page_size > 0 else PAGE_SIZE_RESOURCES
+            page, next_index = file_provider.list_page(start_index, actual_page_size)
+            return page, ResourceStore.encode_cursor(next_index) if next_index is not None else None
+        server.set_list_resources_handler(list_file_resources, prefix=FILE_RESOURCE_URI_PREFIX)
+
+        @server.resource("test://file/{name}")
+        @metrics.instrument("resource")
+        @track_session
+        async def get_file_resource(name: str, ctx: Context = None) -> dict:
+            return await anyio.to_thread.run_sync(file_provider.read_whole, name)
+
+        @server.resource("test://file/{name}/chunk/{index}")
+        @metrics.instrument("resource")
+        @track_session
+        async def get_file_resource_chunk(name: str, index: str, ctx: Context = None) -> dict:
+            return await anyio.to_thread.run_sync(file_provider.read_chunk, name, int(index))
+
+        @server.resource("test://file/{name}/range/{offset}/{length}")
+        @metrics.instrument("resource")
+        @track_session
+        async def get_file_resource_range(name: str, offset: str, length: str, ctx: Context = None) -> dict:
+            return await anyio.to_thread.run_sync(file_provider.read_range, name, int(offset), int(length))
+
     @server.list_resource_templates_handler()
+    @metrics.instrument("resource")
+    @track_session
     async def list_resource_templates_handler(ctx: Context = None) -> list:
-        return [
+        templates = [
             {
                 "uri_template": "test://static/resource/{resource_id}",
                 "name": "Static Resource",
                 "description": "A static resource with a numeric ID.",
                 "parameters": [{"name": "resource_id", "description": "The unique identifier for the static resource."}]
+            },
+            {
+                "uri_template": "test://static/changes/{since_version}",
+                "name": "Static Resource Changes",
+                "description": "Resources changed or removed since a catalog version (see test://static/catalog).",
+                "parameters": [{"name": "since_version", "description": "The catalog version the client last saw."}]
             }
         ]
+        if file_provider:
+            templates += [
+                {
+                    "uri_template": "test://file/{name}",
+                    "name": "File Resource",
+                    "description": f"A whole file from the served directory (up to {file_provider.max_read} bytes).",
+                    "parameters": [{"name": "name", "description": "File name inside the served directory."}]
+                },
+                {
+                    "uri_template": "test://file/{name}/chunk/{index}",
+                    "name": "File Resource Chunk",
+                    "description": f"Chunk `index` of a file, {file_provider.chunk_size} bytes per chunk.",
+                    "parameters": [
+                        {"name": "name", "description": "File name inside the served directory."},
+                        {"name": "index", "description": "Zero-based chunk index."}
+                    ]
+                },
+                {
+                    "uri_template": "test://file/{name}/range/{offset}/{length}",
+                    "name": "File Resource Range",
+                    "description": "An arbitrary byte range of a file.",
+                    "parameters": [
+                        {"name": "name", "description": "File name inside the served directory."},
+                        {"name": "offset", "description": "Byte offset of the range."},
+                        {"name": "length", "description": f"Byte length of the range (at most {file_provider.max_read})."}
+                    ]
+                }
+            ]
+        return templates
+
+    # --- Metrics Resources ---
+    @server.resource("metrics://server")
+    @track_session
+    async def get_metrics(ctx: Context = None) -> dict:
+        return {
+            "uri": "metrics://server",
+            "name": "Server Metrics",
+            "mime_type": "application/json",
+            "text": json.dumps(metrics.snapshot())
+        }
+
+    @server.resource("metrics://server/prometheus")
+    @track_session
+    async def get_metrics_prometheus(ctx: Context = None) -> dict:
+        return {
+            "uri": "metrics://server/prometheus",
+            "name": "Server Metrics (Prometheus)",
+            "mime_type": "text/plain",
+            "text": metrics.to_prometheus()
+        }
+
+    @server.resource("profile://latest")
+    @track_session
+    async def get_latest_profile(ctx: Context = None) -> dict:
+        if profiler is None or profiler.latest_report is None:
+            raise ValueError("No profiling report available yet. Use start_profiling and stop_profiling first.")
+        return {
+            "uri": "profile://latest",
+            "name": f"Profiling Report ({profiler.latest_report_path})",
+            "mime_type": "text/plain",
+            "text": profiler.latest_report
+        }
 
     # --- Prompt Handling Logic ---
     @server.list_prompts_handler()
+    @metrics.instrument("prompt")
+    @track_session
     async def list_prompts_handler(ctx: Context = None) -> list:
-        return [
-            {
-                "name": PromptName.SIMPLE.value,
-                "description": "A prompt without arguments",
-                "arguments": [] 
-            },
-            {
-                "name": PromptName.COMPLEX.value,
-                "description": "A prompt with arguments",
-                "arguments": [
-                    {"name": "temperature", "description": "Temperature setting", "required": True},
-                    {"name": "style", "description": "Output style", "required": False},
-                ],
-            },
-        ]
+        return [prompt.wire() for prompt in PROMPTS]
 
     @server.get_prompt_handler()
+    @metrics.instrument("prompt")
+    @track_session
+    @result_cache.pure()
     async def get_prompt_handler(name: str, arguments: dict[str, any] | None = None, ctx: Context = None) -> dict:
         if name == PromptName.SIMPLE.value:
             return {"messages": [UserMessage(content=TextContent(text="This is a simple prompt without arguments."))]}
@@ -332,44 +691,74 @@ async def main():
                 "messages": [
                     UserMessage(content=TextContent(text=f"This is a complex prompt with arguments: temperature={temp}, style={style}")),
                     AssistantMessage(content=TextContent(text="I understand. You've provided a complex prompt with temperature and style arguments. How would you like me to proceed?")),
-                    UserMessage(content=ImageContent(data=MCP_TINY_IMAGE, mime_type="image/png"))
+                    UserMessage(content=ImageContent(data=tiny_image(), mime_type="image/png"))
                 ]
             }
         else:
             raise ValueError(f"Unknown prompt: {name}")
 
     # --- Argument Completion Logic ---
+    # Prefix indexes are built once here; resource ids are completed from the store's range.
+    completions = CompletionRegistry()
+    for arg_name, values in EXAMPLE_COMPLETIONS.items():
+        completions.register(arg_name, values)
+    completions.register("resourceId", IntegerRangeSource(resource_store.count))
+
     @server.completion_handler()
+    @metrics.instrument("completion")
+    @track_session
     async def completion_handler(ref: dict, argument: dict, ctx: Context = None) -> dict:
         arg_name = argument.get("name")
-        arg_value_str = str(argument.get("value", "")).lower()
-        
-        completions_to_return = []
-
-        if arg_name in EXAMPLE_COMPLETIONS:
-            source_list = EXAMPLE_COMPLETIONS[arg_name]
-            completions_to_return = [item for item in source_list if item.lower().startswith(arg_value_str)]
-        
-        return {
-            "completion": {
-                "values": completions_to_return,
-                "has_more": False, 
-                "total": len(completions_to_return),
-            }
-        }
+        arg_value_str = str(argument.get("value", ""))
+        return {"completion": completions.complete(arg_name, arg_value_str)}
+
+    def mark_resource_updated(uri: str) -> None:
+        # Static resources get a new version (and ETag) before subscribers are notified.
+        if uri.startswith(STATIC_RESOURCE_URI_PREFIX):
+            resource_store.touch(uri[len(STATIC_RESOURCE_URI_PREFIX):])
+        for session in subscribers.get(uri, ()):
+            resource_notifier.mark_dirty((session, uri))
+
+    def remove_subscription(session, uri: str) -> None:
+        resource_notifier.unsubscribe((session, uri))
+        sessions = subscribers.get(uri)
+        if sessions is None:
+            return
+        sessions.discard(session)
+        if not sessions:
+            # Last subscriber gone: stop the URI's update job.
+            del subscribers[uri]
+            job = subscription_jobs.pop(uri, None)
+            if job:
+                job.cancel()
 
     # Subscribe handler
     @server.subscribe_handler()
+    @metrics.instrument("subscription")
+    @track_session
     async def subscribe_handler(uri: str, ctx: Context) -> None:
-        subscriptions.add(uri)
+        subscribers.setdefault(uri, set()).add(ctx.session)
+        resource_notifier.subscribe((ctx.session, uri))
+        if uri not in subscription_jobs:
+            subscription_jobs[uri] = scheduler.call_every(
+                RESOURCE_UPDATE_INTERVAL, lambda: mark_resource_updated(uri),
+                name=f"resource-update:{uri}", jitter=RESOURCE_UPDATE_JITTER
+            )
         await ctx.info(f"Client subscribed to resource: {uri}")
 
     # Unsubscribe handler
     @server.unsubscribe_handler()
+    @metrics.instrument("subscription")
+    @track_session
     async def unsubscribe_handler(uri: str, ctx: Context) -> None:
-        subscriptions.discard(uri)
+        remove_subscription(ctx.session, uri)
         await ctx.info(f"Client unsubscribed from resource: {uri}")
 
+    STARTUP_TIMINGS["setup_ms"] = (time.perf_counter() - setup_started) * 1000
+    return server
+
+async def main():
+    server = create_server()
     print("[SERVER_LOG] Server setup complete. Attempting to start server.run()...", flush=True)
     try:
         await server.run()
@@ -380,4 +769,14 @@ async def main():
         print("[SERVER_LOG] main() function is exiting.", flush=True)
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    import argparse
+    parser = argparse.ArgumentParser(description="MCP 'everything' test server.")
+    parser.add_argument("--workers", type=int, default=0, help="Serve HTTP/SSE from this many worker processes instead of stdio.")
+    parser.add_argument("--host", default="127.0.0.1", help="Listen address for --workers mode.")
+    parser.add_argument("--port", type=int, default=8000, help="Listen port for --workers mode.")
+    cli_args = parser.parse_args()
+    if cli_args.workers > 0:
+        from multi_worker import run_supervisor
+        run_supervisor(cli_args.workers, host=cli_args.host, port=cli_args.port)
+    else:
+        asyncio.run(main())
@@ -0,0 +1,147 @@
+import argparse
+import base64
+import gc
+import json
+import sys
+import tracemalloc
+from functools import lru_cache
+from typing import Callable
+
+from records import AnnotationTemplate, PromptArgument, PromptRecord
+from resource_store import ResourceStore
+
+STATIC_RESOURCE_URI_PREFIX = "test://static/resource/"
+
+
+# --- Baseline (plain dict) representations, as the server built them before records ---
+def dict_entry(resource_index: int) -> dict:
+    uri = f"{STATIC_RESOURCE_URI_PREFIX}{resource_index}"
+    versioning = {"version": 0, "etag": f'"{resource_index}-0"'}
+    if resource_index % 2 == 1:
+        return {"uri": uri, "name": f"Resource {resource_index}", "mime_type": "text/plain",
+                "text": f"Resource {resource_index}: This is a plaintext resource", **versioning}
+    return {"uri": uri, "name": f"Resource {resource_index}", "mime_type": "application/octet-stream",
+            "blob": base64.b64encode(f"Resource {resource_index}: This is a base64 blob".encode('utf-8')).decode('utf-8'),
+            **versioning}
+
+
+def dict_prompt_listing() -> list:
+    return [
+        {"name": "simple_prompt", "description": "A prompt without arguments", "arguments": []},
+        {"name": "complex_prompt", "description": "A prompt with arguments", "arguments": [
+            {"name": "temperature", "description": "Temperature setting", "required": True},
+            {"name": "style", "description": "Output style", "required": False},
+        ]},
+    ]
+
+
+def dict_annotated_parts() -> list:
+    return [{"text": "Error: Operation failed", "annotations": {"priority": 1.0, "audience": ["user", "assistant"]}}]
+
+
+# --- Record representations, as the server serves them now ---
+PROMPTS = (
+    PromptRecord("simple_prompt", "A prompt without arguments"),
+    PromptRecord("complex_prompt", "A prompt with arguments", (
+        PromptArgument("temperature", "Temperature setting", required=True),
+        PromptArgument("style", "Output style", required=False),
+    )),
+)
+ERROR_TEMPLATE = AnnotationTemplate("Error: Operation failed", 1.0, ("user", "assistant"))
+
+
+def record_annotated_parts() -> list:
+    return [{"text": ERROR_TEMPLATE.text, "annotations": ERROR_TEMPLATE.annotations}]
+
+
+def warm_store_reads(count: int) -> Callable[[int], object]:
+    """Reads from a `ResourceStore` whose records for ids 1..count are already cached."""
+    store = ResourceStore(count, cache_size=count)
+    for resource_index in range(1, count + 1):
+        store.get(str(resource_index))
+    return lambda resource_index: store.get(str(resource_index))
+
+
+def store_dicts(count: int) -> Callable[[int], object]:
+    """The store as it was before records: an LRU of wire dicts keyed by (id, version)."""
+    entry = lru_cache(maxsize=count)(lambda resource_index, version: dict_entry(resource_index))
+
+    def read(resource_index: int) -> object:
+        entry(resource_index, 0)
+        return entry
+    return read
+
+
+def store_records(count: int) -> Callable[[int], object]:
+    """Reads ids 1..count through a `ResourceStore` the way the server does, keeping its cached records."""
+    store = ResourceStore(count, cache_size=count)
+
+    def read(resource_index: int) -> object:
+        store.get(str(resource_index))  # The wire dict is built for the read and dropped.
+        return store
+    return read
+
+
+def retained_bytes(build: Callable[[int], object], count: int) -> float:
+    """Bytes per object kept alive when `count` results of `build(i)` are held."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        baseline = tracemalloc.get_traced_memory()[0]
+        held = [build(i) for i in range(1, count + 1)]
+        retained = tracemalloc.get_traced_memory()[0] - baseline
+    finally:
+        tracemalloc.stop()
+    del held
+    return retained / count
+
+
+def run_memory_benchmark(entries: int = 100_000, calls: int = 10_000) -> dict:
+    """Bytes per cached catalog entry and per held handler result: plain dicts versus records."""
+    results = {
+        "resource_entry": {
+            "dict_bytes": retained_bytes(store_dicts(entries), entries),
+            "record_bytes": retained_bytes(store_records(entries), entries),
+        },
+        "resource_read_call": {
+            "dict_bytes": retained_bytes(dict_entry, calls),
+            "record_bytes": retained_bytes(warm_store_reads(calls), calls),
+        },
+        "list_prompts_call": {
+            "dict_bytes": retained_bytes(lambda i: dict_prompt_listing(), calls),
+            "record_bytes": retained_bytes(lambda i: [prompt.wire() for prompt in PROMPTS], calls),
+        },
+        "annotated_message_call": {
+            "dict_bytes": retained_bytes(lambda i: dict_annotated_parts(), calls),
+            "record_bytes": retained_bytes(lambda i: record_annotated_parts(), calls),
+        },
+    }
+    for result in results.values():
+        result["saving"] = 1 - result["record_bytes"] / result["dict_bytes"]
+    return results
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Memory per catalog entry and per call: plain dicts versus slotted records.")
+    parser.add_argument("--entries", type=int, default=100_000, help="Resource entries to read and keep cached.")
+    parser.add_argument("--calls", type=int, default=10_000, help="Handler results to hold.")
+    parser.add_argument("--min-saving", type=float, default=0.0, help="Exit non-zero if any saving falls below this fraction.")
+    parser.add_argument("--output", help="Write JSON results to this file.")
+    args = parser.parse_args(argv)
+
+    results = run_memory_benchmark(args.entries, args.calls)
+    print(f"{'measure':<24} {'dict B':>10} {'record B':>10} {'saving':>8}")
+    for name, result in results.items():
+        print(f"{name:<24} {result['dict_bytes']:>10.1f} {result['record_bytes']:>10.1f} {result['saving']:>7.0%}")
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+    too_small = [name for name, result in results.items() if result["saving"] < args.min_saving]
+    if too_small:
+        print(f"Saving below {args.min_saving:.0%} for: {', '.join(too_small)}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
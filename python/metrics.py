@@ -0,0 +1,141 @@
+import functools
+import inspect
+import os
+import time
+from bisect import bisect_left
+from typing import Callable
+
+# Upper bounds (seconds) of the latency histogram buckets; an implicit +Inf bucket follows.
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class HandlerStats:
+    __slots__ = ("kind", "name", "calls", "errors", "in_flight", "latency_sum", "buckets")
+
+    def __init__(self, kind: str, name: str):
+        self.kind = kind
+        self.name = name
+        self.calls = 0
+        self.errors = 0
+        self.in_flight = 0
+        self.latency_sum = 0.0
+        self.buckets = [0] * (len(LATENCY_BUCKETS) + 1)
+
+    def observe(self, elapsed: float, failed: bool) -> None:
+        self.calls += 1
+        if failed:
+            self.errors += 1
+        self.latency_sum += elapsed
+        self.buckets[bisect_left(LATENCY_BUCKETS, elapsed)] += 1
+
+    def as_dict(self) -> dict:
+        return {
+            "kind": self.kind,
+            "name": self.name,
+            "calls": self.calls,
+            "errors": self.errors,
+            "in_flight": self.in_flight,
+            "latency_sum_s": self.latency_sum,
+            "latency_mean_ms": (self.latency_sum / self.calls * 1000) if self.calls else 0.0,
+            "latency_buckets": {str(le): count for le, count in zip(LATENCY_BUCKETS + ("+Inf",), self.buckets)},
+        }
+
+
+class MetricsRegistry:
+    """Per-handler call/error counts, in-flight gauges and latency histograms.
+
+    Handlers are wrapped with `instrument(kind)`; the wrapper keeps the original
+    signature (via functools.wraps) so FastMCP still derives the same schema.
+    Extra gauges, e.g. notifier counters, are pulled from registered collectors
+    when a snapshot is taken.
+    """
+
+    def __init__(self):
+        self._stats: dict[tuple[str, str], HandlerStats] = {}
+        self._collectors: dict[str, Callable[[], dict]] = {}
+        self.started_at = time.time()
+
+    def stats_for(self, kind: str, name: str) -> HandlerStats:
+        key = (kind, name)
+        stats = self._stats.get(key)
+        if stats is None:
+            stats = self._stats[key] = HandlerStats(kind, name)
+        return stats
+
+    def instrument(self, kind: str, name: str | None = None) -> Callable:
+        def decorator(func: Callable) -> Callable:
+            stats = self.stats_for(kind, name or func.__name__)
+            if inspect.iscoroutinefunction(func):
+                @functools.wraps(func)
+                async def async_wrapper(*args, **kwargs):
+                    stats.in_flight += 1
+                    started = time.perf_counter()
+                    failed = True
+                    try:
+                        result = await func(*args, **kwargs)
+                        failed = False
+                        return result
+                    finally:
+                        stats.in_flight -= 1
+                        stats.observe(time.perf_counter() - started, failed)
+                return async_wrapper
+
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                stats.in_flight += 1
+                started = time.perf_counter()
+                failed = True
+                try:
+                    result = func(*args, **kwargs)
+                    failed = False
+                    return result
+                finally:
+                    stats.in_flight -= 1
+                    stats.observe(time.perf_counter() - started, failed)
+            return wrapper
+        return decorator
+
+    def register_collector(self, name: str, collect: Callable[[], dict]) -> None:
+        self._collectors[name] = collect
+
+    def snapshot(self) -> dict:
+        return {
+            "uptime_s": time.time() - self.started_at,
+            "handlers": [stats.as_dict() for stats in self._stats.values()],
+            "collectors": {name: collect() for name, collect in self._collectors.items()},
+        }
+
+    def to_prometheus(self) -> str:
+        """Renders all metrics in the Prometheus text exposition format."""
+        lines = [
+            "# HELP mcp_handler_calls_total Completed handler calls.",
+            "# TYPE mcp_handler_calls_total counter",
+        ]
+        all_stats = list(self._stats.values())
+        labels = {id(s): f'kind="{s.kind}",name="{s.name}"' for s in all_stats}
+        lines += [f"mcp_handler_calls_total{{{labels[id(s)]}}} {s.calls}" for s in all_stats]
+        lines += ["# HELP mcp_handler_errors_total Handler calls that raised.", "# TYPE mcp_handler_errors_total counter"]
+        lines += [f"mcp_handler_errors_total{{{labels[id(s)]}}} {s.errors}" for s in all_stats]
+        lines += ["# HELP mcp_handler_in_flight Handler calls currently running.", "# TYPE mcp_handler_in_flight gauge"]
+        lines += [f"mcp_handler_in_flight{{{labels[id(s)]}}} {s.in_flight}" for s in all_stats]
+        lines += ["# HELP mcp_handler_latency_seconds Handler latency.", "# TYPE mcp_handler_latency_seconds histogram"]
+        for s in all_stats:
+            cumulative = 0
+            for le, count in zip(LATENCY_BUCKETS + ("+Inf",), s.buckets):
+                cumulative += count
+                lines.append(f'mcp_handler_latency_seconds_bucket{{{labels[id(s)]},le="{le}"}} {cumulative}')
+            lines.append(f"mcp_handler_latency_seconds_sum{{{labels[id(s)]}}} {s.latency_sum}")
+            lines.append(f"mcp_handler_latency_seconds_count{{{labels[id(s)]}}} {s.calls}")
+        for collector_name, collect in self._collectors.items():
+            for key, value in collect().items():
+                if isinstance(value, (int, float)):
+                    lines.append(f"mcp_{collector_name}_{key} {value}")
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path: str) -> None:
+        """Writes the Prometheus text to `path`; the server's scheduler calls this on an interval."""
+        # Write-then-rename so scrapers never read a half-written file.
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w") as f:
+            f.write(self.to_prometheus())
+        os.replace(tmp_path, path)
@@ -0,0 +1,275 @@
+import asyncio
+import multiprocessing
+import re
+import signal
+import socket
+import sys
+import time
+from typing import Any, Callable
+
+WORKER_PATH_RE = re.compile(r"^/w(\d+)/")
+MAX_REQUEST_LINE_BYTES = 8 * 1024
+REQUEST_LINE_TIMEOUT = 10.0
+SERVICE_UNAVAILABLE = b"HTTP/1.1 503 Service Unavailable\r\nContent-Length: 0\r\nConnection: close\r\n\r\n"
+
+
+def mcp_sse_app(index: int) -> Callable:
+    """Default worker app: a full `create_server()` instance served over HTTP/SSE."""
+    from mcp_server import create_server  # Imported in the child; the supervisor never builds a server.
+
+    server = create_server()
+    # The SSE endpoint event tells the client where to POST; the /w{index}/ prefix
+    # lets the supervisor hand those POSTs to the worker holding the session.
+    server.settings.message_path = f"/w{index}/messages/"
+    return server.sse_app()
+
+
+def _close_after_response(app: Callable) -> Callable:
+    """ASGI wrapper that ends every HTTP connection after one response.
+
+    The supervisor routes a connection once, by its first request line, so a
+    kept-alive connection could carry a later request for another worker's
+    session. One request per connection makes every request routable.
+    """
+    async def wrapped(scope: dict, receive: Callable, send: Callable) -> None:
+        if scope["type"] != "http":
+            return await app(scope, receive, send)
+
+        async def send_with_close(message: dict) -> None:
+            if message["type"] == "http.response.start":
+                headers = [(k, v) for k, v in message.get("headers", []) if k.lower() != b"connection"]
+                message = {**message, "headers": headers + [(b"connection", b"close")]}
+            await send(message)
+
+        await app(scope, receive, send_with_close)
+    return wrapped
+
+
+async def _wait_readable(loop: asyncio.AbstractEventLoop, sock: socket.socket) -> None:
+    ready = loop.create_future()
+    loop.add_reader(sock.fileno(), lambda: ready.done() or ready.set_result(None))
+    try:
+        await ready
+    finally:
+        loop.remove_reader(sock.fileno())
+
+
+async def _peek_request_line(loop: asyncio.AbstractEventLoop, conn: socket.socket) -> str:
+    """Returns the connection's HTTP request line without consuming it from the socket."""
+    while True:
+        try:
+            data = conn.recv(MAX_REQUEST_LINE_BYTES, socket.MSG_PEEK)
+        except BlockingIOError:
+            await _wait_readable(loop, conn)
+            continue
+        if not data:
+            raise ConnectionError("connection closed before a request line arrived")
+        line, newline, _ = data.partition(b"\r\n")
+        if newline or len(data) >= MAX_REQUEST_LINE_BYTES:
+            return line.decode("latin-1")
+        # Partial line: the socket stays readable while peeked data is unread, so poll briefly.
+        await asyncio.sleep(0.005)
+
+
+async def _serve_handed_off(app: Callable, channel: socket.socket) -> None:
+    """Serves `app` on connections the supervisor passes over `channel` until it closes."""
+    import uvicorn
+
+    config = uvicorn.Config(_close_after_response(app), log_level="warning")
+    config.load()
+    server = uvicorn.Server(config)
+    server.lifespan = config.lifespan_class(config)
+    await server.startup(sockets=[])
+
+    def protocol_factory() -> asyncio.Protocol:
+        return config.http_protocol_class(config=config, server_state=server.server_state, app_state=server.lifespan.state)
+
+    loop = asyncio.get_running_loop()
+    channel.setblocking(False)
+    try:
+        while True:
+            await _wait_readable(loop, channel)
+            try:
+                message, fds, _, _ = socket.recv_fds(channel, 1, 16)
+            except BlockingIOError:
+                continue
+            if not message and not fds:
+                break  # Supervisor went away.
+            for fd in fds:
+                conn = socket.socket(fileno=fd)
+                conn.setblocking(False)
+                loop.create_task(loop.connect_accepted_socket(protocol_factory, conn))
+    finally:
+        await server.shutdown()
+
+
+def _worker_main(index: int, channel: socket.socket, app_factory: Callable[[int], Any]) -> None:
+    """Entry point of one worker process: serves the connections handed to it by the supervisor."""
+    app = app_factory(index)
+    print(f"[SERVER_LOG][WORKER {index}] Ready for connections.", flush=True)
+    asyncio.run(_serve_handed_off(app, channel))
+
+
+class WorkerSupervisor:
+    """Runs `workers` server processes behind one HTTP/SSE listener on `host:port`.
+
+    An SSE session is a long-lived GET stream plus POSTs to the message path it
+    advertises, and both must reach the same process. The kernel's SO_REUSEPORT
+    hashing cannot guarantee that, so the supervisor accepts each connection,
+    peeks at its request line without reading it, and passes the socket itself
+    to a worker over a Unix socket pair: `/w{i}/...` goes to worker i, anything
+    else (new `/sse` streams) is spread round-robin over live workers. Workers
+    then read and write the connection directly; no request or response bytes
+    pass through the supervisor. Workers close each connection after one
+    response, so every request is routed on its own. Workers that exit are
+    restarted, with a back-off when they crash repeatedly. POSIX only.
+    """
+
+    def __init__(self, workers: int, host: str = "127.0.0.1", port: int = 8000,
+                 app_factory: Callable[[int], Any] = mcp_sse_app):
+        if workers < 1:
+            raise ValueError(f"Worker count must be at least 1, got {workers}.")
+        self.workers = workers
+        self.host = host
+        self.port = port
+        self.app_factory = app_factory
+        self._context = multiprocessing.get_context("spawn")
+        self._processes: list[multiprocessing.Process | None] = [None] * workers
+        self._channels: list[socket.socket | None] = [None] * workers
+        self._started_at = [0.0] * workers
+        self._crash_streak = [0] * workers
+        self._next_worker = 0
+        self._listener: socket.socket | None = None
+        self.restarts = 0
+        self.connections = 0
+        self.rejected = 0
+
+    @property
+    def address(self) -> tuple[str, int]:
+        """The bound listen address; useful with `port=0`."""
+        return self._listener.getsockname()[:2] if self._listener else (self.host, self.port)
+
+    def _start_worker(self, index: int) -> None:
+        supervisor_end, worker_end = socket.socketpair()
+        process = self._context.Process(target=_worker_main, args=(index, worker_end, self.app_factory),
+                                        name=f"mcp-worker-{index}", daemon=True)
+        process.start()
+        worker_end.close()
+        supervisor_end.setblocking(False)
+        if self._channels[index] is not None:
+            self._channels[index].close()
+        self._channels[index] = supervisor_end
+        self._processes[index] = process
+        self._started_at[index] = time.monotonic()
+
+    def _alive_workers(self) -> list[int]:
+        return [i for i, p in enumerate(self._processes) if p is not None and p.is_alive()]
+
+    def _route(self, path: str) -> int | None:
+        match = WORKER_PATH_RE.match(path)
+        if match:
+            index = int(match.group(1))
+            return index if index < self.workers else None
+        alive = self._alive_workers()
+        if not alive:
+            return None
+        index = alive[self._next_worker % len(alive)]
+        self._next_worker += 1
+        return index
+
+    async def _monitor(self) -> None:
+        while True:
+            await asyncio.sleep(0.5)
+            for index, process in enumerate(self._processes):
+                if process is None or process.is_alive():
+                    continue
+                lifetime = time.monotonic() - self._started_at[index]
+                self._crash_streak[index] = self._crash_streak[index] + 1 if lifetime < 5 else 0
+                delay = min(30.0, 0.5 * 2 ** self._crash_streak[index]) if self._crash_streak[index] else 0
+                print(f"[SERVER_LOG][SUPERVISOR] Worker {index} exited with code {process.exitcode}; restarting in {delay:.1f}s.", file=sys.stderr, flush=True)
+                self._processes[index] = None
+                asyncio.get_running_loop().call_later(delay, self._restart_worker, index)
+
+    def _restart_worker(self, index: int) -> None:
+        self.restarts += 1
+        self._start_worker(index)
+
+    async def _dispatch(self, conn: socket.socket) -> None:
+        loop = asyncio.get_running_loop()
+        self.connections += 1
+        try:
+            try:
+                request_line = await asyncio.wait_for(_peek_request_line(loop, conn), timeout=REQUEST_LINE_TIMEOUT)
+            except (asyncio.TimeoutError, OSError):
+                return
+            parts = request_line.split(" ")
+            index = self._route(parts[1] if len(parts) >= 2 else "/")
+            channel = self._channels[index] if index is not None else None
+            try:
+                if channel is None or not self._processes[index] or not self._processes[index].is_alive():
+                    raise ConnectionRefusedError("no live worker")
+                socket.send_fds(channel, [b"c"], [conn.fileno()])
+            except OSError as e:
+                self.rejected += 1
+                print(f"[SERVER_LOG][SUPERVISOR] Cannot route {request_line!r}: {e}", file=sys.stderr, flush=True)
+                try:
+                    conn.send(SERVICE_UNAVAILABLE)
+                    conn.shutdown(socket.SHUT_WR)
+                    conn.recv(MAX_REQUEST_LINE_BYTES)  # Unread request bytes would turn close() into a reset.
+                except OSError:
+                    pass
+        finally:
+            conn.close()  # The worker holds its own duplicate of a handed-off socket.
+
+    async def serve(self) -> None:
+        for index in range(self.workers):
+            self._start_worker(index)
+        loop = asyncio.get_running_loop()
+        self._listener = socket.create_server((self.host, self.port), backlog=1024)
+        self._listener.setblocking(False)
+        monitor = asyncio.create_task(self._monitor())
+        dispatches: set[asyncio.Task] = set()
+        print(f"[SERVER_LOG][SUPERVISOR] Dispatching {self.address[0]}:{self.address[1]} to {self.workers} workers", flush=True)
+        try:
+            while True:
+                conn, _ = await loop.sock_accept(self._listener)
+                conn.setblocking(False)
+                task = asyncio.create_task(self._dispatch(conn))
+                dispatches.add(task)
+                task.add_done_callback(dispatches.discard)
+        finally:
+            for task in (monitor, *dispatches):
+                task.cancel()
+            await asyncio.gather(monitor, *dispatches, return_exceptions=True)
+            self._listener.close()
+            self.shutdown()
+
+    def shutdown(self) -> None:
+        for channel in self._channels:
+            if channel is not None:
+                channel.close()
+        for process in self._processes:
+            if process is not None and process.is_alive():
+                process.terminate()
+        for process in self._processes:
+            if process is not None:
+                process.join(timeout=5)
+
+
+def run_supervisor(workers: int, host: str = "127.0.0.1", port: int = 8000) -> None:
+    supervisor = WorkerSupervisor(workers, host=host, port=port)
+
+    async def serve_until_signalled() -> None:
+        serve_task = asyncio.create_task(supervisor.serve())
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(sig, serve_task.cancel)
+            except NotImplementedError:
+                pass  # Windows: fall back to KeyboardInterrupt.
+        try:
+            await serve_task
+        except asyncio.CancelledError:
+            pass
+
+    asyncio.run(serve_until_signalled())
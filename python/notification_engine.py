@@ -0,0 +1,113 @@
+import asyncio
+import sys
+from typing import Awaitable, Callable
+
+
+class ResourceUpdateNotifier:
+    """Coalescing, concurrent fan-out of `notifications/resources/updated`.
+
+    Subscribed URIs are marked dirty (every `interval` seconds, or explicitly
+    via `mark_dirty`). A URI that is already waiting to be sent is coalesced
+    instead of queued twice. Dirty URIs are sent concurrently with at most
+    `max_in_flight` sends outstanding; when the transport is slow the
+    dispatcher stops pulling work, dirty URIs keep coalescing, and anything
+    beyond `max_pending` is dropped and counted.
+    """
+
+    def __init__(self, interval: float = 5.0, max_in_flight: int = 64, max_pending: int = 10_000, send_timeout: float | None = 10.0):
+        if max_in_flight < 1:
+            raise ValueError(f"max_in_flight must be at least 1, got {max_in_flight}.")
+        self.interval = interval
+        self.max_in_flight = max_in_flight
+        self.max_pending = max_pending
+        self.send_timeout = send_timeout
+        self.subscriptions: set[str] = set()
+        # dict used as an insertion-ordered set so URIs go out oldest first.
+        self._dirty: dict[str, None] = {}
+        self._wakeup = asyncio.Event()
+        self._in_flight = 0
+        self.sent = 0
+        self.dropped = 0
+        self.coalesced = 0
+        self.failed = 0
+
+    def subscribe(self, uri: str) -> None:
+        self.subscriptions.add(uri)
+
+    def unsubscribe(self, uri: str) -> None:
+        self.subscriptions.discard(uri)
+        self._dirty.pop(uri, None)
+
+    def mark_dirty(self, uri: str) -> None:
+        if uri not in self.subscriptions:
+            return
+        if uri in self._dirty:
+            self.coalesced += 1
+        elif len(self._dirty) >= self.max_pending:
+            self.dropped += 1
+        else:
+            self._dirty[uri] = None
+            self._wakeup.set()
+
+    def mark_all_dirty(self) -> None:
+        for uri in self.subscriptions:
+            self.mark_dirty(uri)
+
+    def stats(self) -> dict:
+        return {
+            "subscriptions": len(self.subscriptions),
+            "pending": len(self._dirty),
+            "in_flight": self._in_flight,
+            "sent": self.sent,
+            "dropped": self.dropped,
+            "coalesced": self.coalesced,
+            "failed": self.failed,
+        }
+
+    async def _send_one(self, send: Callable[[str], Awaitable[None]], uri: str, slots: asyncio.Semaphore) -> None:
+        self._in_flight += 1
+        try:
+            await asyncio.wait_for(send(uri), timeout=self.send_timeout)
+            self.sent += 1
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self.failed += 1
+            print(f"[SERVER_LOG] Error sending resource update for {uri}: {e!r}", file=sys.stderr, flush=True)
+        finally:
+            self._in_flight -= 1
+            slots.release()
+
+    async def _tick(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            self.mark_all_dirty()
+
+    async def run(self, send: Callable[[str], Awaitable[None]]) -> None:
+        """Dispatches dirty URIs through `send` until cancelled."""
+        slots = asyncio.Semaphore(self.max_in_flight)
+        sends: set[asyncio.Task] = set()
+        ticker = asyncio.create_task(self._tick()) if self.interval > 0 else None
+        try:
+            while True:
+                await self._wakeup.wait()
+                self._wakeup.clear()
+                while self._dirty:
+                    # Backpressure: wait for a free slot before taking the next URI,
+                    # so updates arriving meanwhile coalesce in the dirty set.
+                    await slots.acquire()
+                    if not self._dirty:
+                        slots.release()
+                        break
+                    uri = next(iter(self._dirty))
+                    del self._dirty[uri]
+                    task = asyncio.create_task(self._send_one(send, uri, slots))
+                    sends.add(task)
+                    task.add_done_callback(sends.discard)
+        finally:
+            pending = list(sends)
+            if ticker:
+                pending.append(ticker)
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
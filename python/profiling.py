@@ -0,0 +1,109 @@
+import asyncio
+import cProfile
+import io
+import os
+import pstats
+import tempfile
+import time
+import tracemalloc
+
+PROFILE_DIR_ENV_VAR = "MCP_PROFILE_DIR"
+MAX_PROFILE_DURATION = 600
+
+
+class ProfilingSession:
+    """Bounded cProfile/tracemalloc capture on the live event loop.
+
+    `start()` enables the profilers on the calling thread (the event loop, where
+    every handler runs) and schedules an automatic `stop()` after `duration`
+    seconds. `stop()` writes the pstats dump (`.prof`) and a text report with the
+    hottest functions and top allocation sites into `output_dir`. If tracemalloc
+    was already tracing, its traces are left alone: the report lists allocation
+    growth against a snapshot taken at `start()`, and tracing keeps running.
+    """
+
+    def __init__(self, output_dir: str | None = None, top: int = 30):
+        self.output_dir = output_dir or os.environ.get(PROFILE_DIR_ENV_VAR) or tempfile.gettempdir()
+        self.top = top
+        self.latest_report: str | None = None
+        self.latest_report_path: str | None = None
+        self._profiler: cProfile.Profile | None = None
+        self._owns_tracemalloc = False
+        self._tracing_memory = False
+        self._memory_baseline: tracemalloc.Snapshot | None = None
+        self._started_at = 0.0
+        self._auto_stop: asyncio.TimerHandle | None = None
+
+    @property
+    def running(self) -> bool:
+        return self._profiler is not None or self._tracing_memory
+
+    def start(self, duration: float, cpu: bool = True, memory: bool = True) -> None:
+        if self.running:
+            raise ValueError("A profiling session is already running; stop it first.")
+        if not cpu and not memory:
+            raise ValueError("Enable at least one of cpu or memory profiling.")
+        if not 0 < duration <= MAX_PROFILE_DURATION:
+            raise ValueError(f"Duration must be between 0 and {MAX_PROFILE_DURATION} seconds, got {duration}.")
+        if cpu:
+            profiler = cProfile.Profile()
+            profiler.enable()  # Raises ValueError if another profiler is already active.
+            self._profiler = profiler
+        if memory:
+            self._owns_tracemalloc = not tracemalloc.is_tracing()
+            if self._owns_tracemalloc:
+                tracemalloc.start(10)
+            else:
+                self._memory_baseline = tracemalloc.take_snapshot()
+            self._tracing_memory = True
+        self._started_at = time.monotonic()
+        self._auto_stop = asyncio.get_running_loop().call_later(duration, self._stop_quietly)
+
+    def _stop_quietly(self) -> None:
+        self._auto_stop = None
+        if self.running:
+            self.stop()
+
+    def stop(self) -> str:
+        """Stops profiling, writes the report files and returns the text report."""
+        if not self.running:
+            raise ValueError("No profiling session is running.")
+        if self._auto_stop:
+            self._auto_stop.cancel()
+            self._auto_stop = None
+        elapsed = time.monotonic() - self._started_at
+        os.makedirs(self.output_dir, exist_ok=True)
+        base_path = os.path.join(self.output_dir, f"mcp-profile-{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}")
+        report = io.StringIO()
+        report.write(f"Profiling window: {elapsed:.2f}s\n")
+
+        if self._profiler is not None:
+            profiler, self._profiler = self._profiler, None
+            profiler.disable()
+            profiler.dump_stats(f"{base_path}.prof")
+            report.write(f"\n=== CPU: top {self.top} functions by cumulative time ({base_path}.prof) ===\n")
+            pstats.Stats(profiler, stream=report).sort_stats(pstats.SortKey.CUMULATIVE).print_stats(self.top)
+
+        if self._tracing_memory:
+            self._tracing_memory = False
+            snapshot = tracemalloc.take_snapshot()
+            current, peak = tracemalloc.get_traced_memory()
+            if self._owns_tracemalloc:
+                tracemalloc.stop()
+            exclude_tracemalloc = (tracemalloc.Filter(False, tracemalloc.__file__),)
+            snapshot = snapshot.filter_traces(exclude_tracemalloc)
+            baseline, self._memory_baseline = self._memory_baseline, None
+            if baseline is None:
+                report.write(f"\n=== Memory: top {self.top} allocation sites (current {current} B, peak {peak} B) ===\n")
+                stats = snapshot.statistics("lineno")
+            else:
+                report.write(f"\n=== Memory: top {self.top} allocation sites by growth (current {current} B, peak {peak} B since tracing began) ===\n")
+                stats = snapshot.compare_to(baseline.filter_traces(exclude_tracemalloc), "lineno")
+            for stat in stats[:self.top]:
+                report.write(f"{stat}\n")
+
+        self.latest_report = report.getvalue()
+        self.latest_report_path = f"{base_path}.txt"
+        with open(self.latest_report_path, "w") as f:
+            f.write(self.latest_report)
+        return self.latest_report
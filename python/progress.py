@@ -0,0 +1,78 @@
+import os
+import sys
+import time
+from typing import Awaitable, Callable
+
+
+class ProgressReporter:
+    """Throttles and coalesces progress notifications for one operation.
+
+    `update(current)` only sends once at least `min_interval` seconds have
+    passed since the last notification and progress has advanced by at least
+    `min_delta` (a fraction of `total`) since then; set either to 0 to drop
+    that condition. Suppressed updates are coalesced: the next notification
+    carries the latest value. `finish()` delivers the final value, unless no
+    progress was ever made (as with a zero-step operation).
+
+    If a send fails (typically because the client has gone away) the reporter
+    sets `cancelled` and sends nothing more; the caller checks the flag right
+    after each update and stops instead of running to completion for nobody.
+    """
+
+    def __init__(self, send: Callable[[int, int], Awaitable[None]], total: int, min_interval: float = 0.1, min_delta: float = 0.01):
+        if total < 0 or min_interval < 0 or min_delta < 0:
+            raise ValueError(f"Invalid progress settings: total={total}, min_interval={min_interval}, min_delta={min_delta}.")
+        self._send = send
+        self.total = total
+        self.min_interval = min_interval
+        self.min_delta = min_delta
+        self.current = 0
+        self.cancelled = False
+        self.sent = 0
+        self.suppressed = 0
+        self._last_sent_value: int | None = None
+        self._last_sent_at = float("-inf")
+
+    async def _deliver(self, current: int) -> None:
+        try:
+            await self._send(current, self.total)
+        except Exception as e:
+            print(f"[SERVER_LOG] Progress notification failed, cancelling the operation: {e!r}", file=sys.stderr, flush=True)
+            self.cancelled = True
+            return
+        self.sent += 1
+        self._last_sent_value = current
+        self._last_sent_at = time.monotonic()
+
+    async def update(self, current: int) -> None:
+        self.current = current
+        if self.cancelled:
+            return
+        last = self._last_sent_value if self._last_sent_value is not None else 0
+        advanced = (current - last) / self.total if self.total else 1.0
+        if time.monotonic() - self._last_sent_at < self.min_interval or advanced < self.min_delta:
+            self.suppressed += 1
+            return
+        await self._deliver(current)
+
+    async def finish(self) -> None:
+        """Sends the latest value unless it was already the last one sent, or is still zero."""
+        if not self.cancelled and self.current and self._last_sent_value != self.current:
+            await self._deliver(self.current)
+
+    def stats(self) -> dict:
+        return {"sent": self.sent, "suppressed": self.suppressed, "cancelled": int(self.cancelled)}
+
+
+def progress_setting_from_env(name: str, default: float) -> float:
+    """Reads a non-negative throttle setting from the environment variable `name`, falling back to `default`."""
+    raw_value = os.environ.get(name)
+    if not raw_value:
+        return default
+    try:
+        value = float(raw_value)
+    except ValueError:
+        raise ValueError(f"{name} must be a number, got {raw_value!r}.")
+    if not value >= 0:
+        raise ValueError(f"{name} must be non-negative, got {value}.")
+    return value
@@ -0,0 +1,106 @@
+import base64
+from types import MappingProxyType
+
+
+class _Record:
+    """Base for immutable `__slots__` records: fields are assigned once, in `__init__`."""
+
+    __slots__ = ()
+
+    def _set(self, **fields) -> None:
+        for name, value in fields.items():
+            object.__setattr__(self, name, value)
+
+    def __setattr__(self, name: str, value) -> None:
+        raise AttributeError(f"{type(self).__name__} is immutable.")
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError(f"{type(self).__name__} is immutable.")
+
+    def __repr__(self) -> str:
+        fields = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.__slots__ if not name.startswith("_"))
+        return f"{type(self).__name__}({fields})"
+
+
+class ResourceRecord(_Record):
+    """One resource: metadata plus either `text` or raw `blob` bytes.
+
+    `wire()` returns the dict handlers return (blob base64-encoded, `version`
+    and `etag` added). The base64 payload and etag are rendered on first use
+    and kept in slots, so later calls only assemble a new flat dict of shared
+    strings, which callers may modify freely. Keeping the parts rather than a
+    whole wire dict per record is what keeps a cached record smaller than that
+    dict.
+    """
+
+    __slots__ = ("uri", "name", "mime_type", "text", "blob", "version", "_payload", "_etag")
+
+    def __init__(self, uri: str, name: str, mime_type: str, text: str | None = None, blob: bytes | None = None, version: int = 0):
+        if (text is None) == (blob is None):
+            raise ValueError(f"Resource {uri} needs exactly one of text or blob.")
+        self._set(uri=uri, name=name, mime_type=mime_type, text=text, blob=blob, version=version, _payload=None, _etag=None)
+
+    @property
+    def etag(self) -> str:
+        return f'"{self.uri.rsplit("/", 1)[-1]}-{self.version}"'
+
+    def with_version(self, version: int) -> "ResourceRecord":
+        if version == self.version:
+            return self
+        return ResourceRecord(self.uri, self.name, self.mime_type, text=self.text, blob=self.blob, version=version)
+
+    def wire(self) -> dict:
+        if self._payload is None:
+            self._set(_payload=self.text if self.text is not None else base64.b64encode(self.blob).decode('utf-8'),
+                      _etag=self.etag)
+        if self.text is not None:
+            return {"uri": self.uri, "name": self.name, "mime_type": self.mime_type, "text": self._payload,
+                    "version": self.version, "etag": self._etag}
+        return {"uri": self.uri, "name": self.name, "mime_type": self.mime_type, "blob": self._payload,
+                "version": self.version, "etag": self._etag}
+
+
+class PromptArgument(_Record):
+    __slots__ = ("name", "description", "required")
+
+    def __init__(self, name: str, description: str, required: bool = False):
+        self._set(name=name, description=description, required=required)
+
+    def wire(self) -> dict:
+        return {"name": self.name, "description": self.description, "required": self.required}
+
+
+class PromptRecord(_Record):
+    """A prompt definition; its `list_prompts` entry is rendered once, at construction.
+
+    The rendered arguments are a tuple of read-only mappings, so `wire()` hands
+    out a shallow copy that shares them safely.
+    """
+
+    __slots__ = ("name", "description", "arguments", "_wire")
+
+    def __init__(self, name: str, description: str, arguments: tuple[PromptArgument, ...] = ()):
+        self._set(name=name, description=description, arguments=tuple(arguments))
+        self._set(_wire={"name": name, "description": description,
+                         "arguments": tuple(MappingProxyType(argument.wire()) for argument in self.arguments)})
+
+    def wire(self) -> dict:
+        return dict(self._wire)
+
+
+class AnnotationTemplate(_Record):
+    """Text plus the priority/audience annotations attached to it, pre-rendered once.
+
+    `annotations` hands out a copy of the rendered dict; its `audience` is the
+    template's tuple, which needs no copy.
+    """
+
+    __slots__ = ("text", "priority", "audience", "_annotations")
+
+    def __init__(self, text: str, priority: float, audience: tuple[str, ...]):
+        self._set(text=text, priority=priority, audience=tuple(audience))
+        self._set(_annotations={"priority": priority, "audience": self.audience})
+
+    @property
+    def annotations(self) -> dict:
+        return dict(self._annotations)
@@ -0,0 +1,198 @@
+import base64
+import os
+from collections import deque
+from functools import lru_cache
+from typing import Iterable
+
+from records import ResourceRecord
+
+STATIC_RESOURCE_URI_PREFIX = "test://static/resource/"
+RESOURCE_COUNT_ENV_VAR = "MCP_STATIC_RESOURCE_COUNT"
+DEFAULT_CHANGE_LOG_SIZE = 10_000
+# Upper bound on the ids one changes_since() answer may return before it asks for a re-list.
+MAX_CHANGES = 1000
+
+
+class ResourceStore:
+    """Indexed catalog for `test://static/resource/{id}` with ids 1..count.
+
+    Entries are `ResourceRecord`s generated on first access (TypeScript-twin
+    style: odd ids are text, even ids are blobs). The records are kept in a
+    bounded LRU cache, so the catalog size costs nothing until pages are
+    actually read. A cached record holds its base64 payload and etag rendered,
+    so each read only assembles the caller's own wire dict. Hand-written
+    records passed in `fixed` take precedence over generated ones for their id.
+
+    The catalog is versioned. `touch()` and `resize()` bump `version` and append
+    to a bounded change log, which `changes_since()` answers from. Every entry
+    carries the `version` it last changed at and a matching `etag`. List cursors
+    pin the catalog size at the start of a listing, so ids added mid-listing do
+    not shift later pages.
+    """
+
+    def __init__(self, count: int, fixed: Iterable[ResourceRecord] | None = None, cache_size: int = 1024,
+                 change_log_size: int = DEFAULT_CHANGE_LOG_SIZE):
+        if count < 0:
+            raise ValueError(f"Resource count must be non-negative, got {count}.")
+        self.count = count
+        self.version = 0
+        # Only touched ids are tracked; every other id is at version 0.
+        self._entry_versions: dict[int, int] = {}
+        # (version, first_index, last_index) per change; the oldest are dropped beyond change_log_size.
+        self._changes: deque[tuple[int, int, int]] = deque(maxlen=change_log_size)
+        self._change_log_floor = 0
+        self._fixed: dict[int, ResourceRecord] = {}
+        for record in fixed or []:
+            resource_index = self.parse_id(record.uri[len(STATIC_RESOURCE_URI_PREFIX):])
+            if resource_index is None:
+                raise ValueError(f"Fixed resource has a non-numeric URI: {record.uri}")
+            self._fixed[resource_index] = record
+        # Cached per (id, version): a touched entry is rebuilt once and the stale one ages out of the LRU.
+        self._record = lru_cache(maxsize=cache_size)(self._build_record)
+
+    def __len__(self) -> int:
+        return self.count
+
+    @staticmethod
+    def parse_id(resource_id: str) -> int | None:
+        """Returns the integer id for a canonical decimal string, else None."""
+        if not resource_id.isascii() or not resource_id.isdigit():
+            return None
+        resource_index = int(resource_id)
+        if str(resource_index) != resource_id:
+            return None  # Reject "007"-style ids; URIs must match exactly.
+        return resource_index
+
+    def _build_record(self, resource_index: int, version: int) -> ResourceRecord:
+        fixed = self._fixed.get(resource_index)
+        if fixed is not None:
+            return fixed.with_version(version)
+        uri = f"{STATIC_RESOURCE_URI_PREFIX}{resource_index}"
+        if resource_index % 2 == 1:
+            return ResourceRecord(uri, f"Resource {resource_index}", "text/plain",
+                                  text=f"Resource {resource_index}: This is a plaintext resource", version=version)
+        return ResourceRecord(uri, f"Resource {resource_index}", "application/octet-stream",
+                              blob=f"Resource {resource_index}: This is a base64 blob".encode('utf-8'), version=version)
+
+    def _versioned_entry(self, resource_index: int) -> dict:
+        return self._record(resource_index, self._entry_versions.get(resource_index, 0)).wire()
+
+    def get(self, resource_id: str) -> dict | None:
+        resource_index = self.parse_id(resource_id)
+        if resource_index is None or not 1 <= resource_index <= self.count:
+            return None
+        return self._versioned_entry(resource_index)
+
+    def page(self, start_index: int, page_size: int, snapshot_count: int | None = None) -> list[dict]:
+        """Returns entries at zero-based positions [start_index, start_index + page_size) of a catalog of
+        `snapshot_count` entries (default: the current size), skipping ids removed since."""
+        end_index = min(start_index + page_size, self.count if snapshot_count is None else snapshot_count, self.count)
+        return [self._versioned_entry(position + 1) for position in range(max(start_index, 0), end_index)]
+
+    # --- Versioning ---
+    def _record_change(self, first_index: int, last_index: int) -> None:
+        self.version += 1
+        if len(self._changes) == self._changes.maxlen:
+            self._change_log_floor = self._changes[0][0]
+        self._changes.append((self.version, first_index, last_index))
+
+    def touch(self, resource_id: str) -> bool:
+        """Marks an existing resource as changed; returns False for unknown ids."""
+        resource_index = self.parse_id(resource_id)
+        if resource_index is None or not 1 <= resource_index <= self.count:
+            return False
+        self._record_change(resource_index, resource_index)
+        self._entry_versions[resource_index] = self.version
+        return True
+
+    def resize(self, count: int) -> None:
+        """Grows or shrinks the catalog to ids 1..count."""
+        if count < 0:
+            raise ValueError(f"Resource count must be non-negative, got {count}.")
+        if count == self.count:
+            return
+        old_count, self.count = self.count, count
+        if count < old_count:
+            for resource_index in [i for i in self._entry_versions if i > count]:
+                del self._entry_versions[resource_index]
+        self._record_change(min(old_count, count) + 1, max(old_count, count))
+
+    def changes_since(self, since_version: int, limit: int = MAX_CHANGES) -> dict:
+        """Entries changed or added after `since_version`, and URIs removed since then.
+
+        `reset` is true when the answer would exceed `limit` ids or the change
+        log no longer reaches back to `since_version`; the client should then
+        re-list the catalog.
+        """
+        if not 0 <= since_version <= self.version:
+            raise ValueError(f"Version must be between 0 and {self.version}, got {since_version}.")
+        result = {"version": self.version, "since": since_version, "reset": False, "changed": [], "removed": []}
+        if since_version < self._change_log_floor:
+            result["reset"] = True
+            return result
+        changed_ids: set[int] = set()
+        for version, first_index, last_index in reversed(self._changes):
+            if version <= since_version:
+                break
+            if len(changed_ids) + (last_index - first_index + 1) > limit:
+                result["reset"] = True
+                return result
+            changed_ids.update(range(first_index, last_index + 1))
+        for resource_index in sorted(changed_ids):
+            if resource_index <= self.count:
+                result["changed"].append(self._versioned_entry(resource_index))
+            else:
+                result["removed"].append(f"{STATIC_RESOURCE_URI_PREFIX}{resource_index}")
+        return result
+
+    @staticmethod
+    def encode_cursor(start_index: int) -> str:
+        return base64.b64encode(str(start_index).encode('utf-8')).decode('utf-8')
+
+    @staticmethod
+    def decode_cursor(cursor: str) -> int:
+        start_index = int(base64.b64decode(cursor, validate=True).decode('utf-8'))
+        if start_index < 0:
+            raise ValueError(f"Cursor offset must be non-negative, got {start_index}.")
+        return start_index
+
+    @staticmethod
+    def encode_snapshot_cursor(version: int, count: int, start_index: int) -> str:
+        return base64.b64encode(f"{version}.{count}.{start_index}".encode('utf-8')).decode('utf-8')
+
+    def decode_snapshot_cursor(self, cursor: str) -> tuple[int, int, int]:
+        """Returns (version, count, start_index); plain offset cursors map onto the current catalog."""
+        parts = base64.b64decode(cursor, validate=True).decode('utf-8').split(".")
+        if len(parts) == 1:
+            return self.version, self.count, self.decode_cursor(cursor)
+        if len(parts) != 3:
+            raise ValueError(f"Malformed cursor: {cursor!r}")
+        version, count, start_index = (int(part) for part in parts)
+        if min(version, count, start_index) < 0 or version > self.version:
+            raise ValueError(f"Cursor does not match this catalog: {cursor!r}")
+        return version, count, start_index
+
+    def list_page(self, cursor: str | None, page_size: int) -> tuple[list[dict], str | None]:
+        """Returns one page and the cursor for the next, all within the snapshot the listing started from."""
+        if cursor:
+            version, count, start_index = self.decode_snapshot_cursor(cursor)
+        else:
+            version, count, start_index = self.version, self.count, 0
+        end_index = min(start_index + page_size, count)
+        # Stop early if the catalog has shrunk below the snapshot: the remaining pages would be empty.
+        next_cursor = self.encode_snapshot_cursor(version, count, end_index) if end_index < min(count, self.count) else None
+        return self.page(start_index, page_size, snapshot_count=count), next_cursor
+
+
+def resource_count_from_env(default: int) -> int:
+    """Reads the catalog size from MCP_STATIC_RESOURCE_COUNT, falling back to `default`."""
+    raw_value = os.environ.get(RESOURCE_COUNT_ENV_VAR)
+    if not raw_value:
+        return default
+    try:
+        count = int(raw_value)
+    except ValueError:
+        raise ValueError(f"{RESOURCE_COUNT_ENV_VAR} must be an integer, got {raw_value!r}.")
+    if count < 0:
+        raise ValueError(f"{RESOURCE_COUNT_ENV_VAR} must be non-negative, got {count}.")
+    return count
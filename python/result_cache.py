@@ -0,0 +1,262 @@
+import functools
+import inspect
+import os
+import sys
+from collections import OrderedDict
+from typing import Any, Callable, Hashable
+
+RESULT_CACHE_ENV_VAR = "MCP_RESULT_CACHE"
+RESULT_CACHE_ENTRIES_ENV_VAR = "MCP_RESULT_CACHE_ENTRIES"
+RESULT_CACHE_BYTES_ENV_VAR = "MCP_RESULT_CACHE_BYTES"
+# Parameters injected by the server rather than supplied by the caller.
+_IGNORED_PARAMETERS = frozenset({"ctx"})
+
+
+class _Unhashable(Exception):
+    pass
+
+
+class _Unfreezable(Exception):
+    pass
+
+
+def _read_only(self, *args, **kwargs):
+    raise TypeError(f"Cached {type(self).__mro__[1].__name__} is read-only.")
+
+
+class _ReadOnlyList(list):
+    __slots__ = ()
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _read_only
+    append = extend = insert = pop = remove = clear = sort = reverse = _read_only
+
+
+class _ReadOnlyDict(dict):
+    __slots__ = ()
+    __setitem__ = __delitem__ = __ior__ = _read_only
+    pop = popitem = setdefault = update = clear = _read_only
+
+
+@functools.cache
+def _frozen_model_class(cls: type) -> type:
+    return type(cls.__name__, (cls,), {"model_config": {**cls.model_config, "frozen": True},
+                                       "__module__": cls.__module__, "__qualname__": cls.__qualname__})
+
+
+def _freeze(value: Any) -> Any:
+    """Read-only snapshot of a result, safe for every cache hit to share.
+
+    Lists and dicts become read-only subclasses (still `list`/`dict`, so they
+    compare and serialize as before) and pydantic models become instances of a
+    frozen subclass, recursively. Anything else raises `_Unfreezable`.
+    """
+    if isinstance(value, (str, bytes, int, float, bool, type(None))):
+        return value
+    if isinstance(value, list):
+        return _ReadOnlyList(_freeze(v) for v in value)
+    if isinstance(value, tuple):
+        return tuple(_freeze(v) for v in value)
+    if isinstance(value, dict):
+        return _ReadOnlyDict((k, _freeze(v)) for k, v in value.items())
+    if isinstance(getattr(value, "model_config", None), dict) and hasattr(value, "model_construct"):
+        fields = {name: _freeze(v) for name, v in {**value.__dict__, **(value.__pydantic_extra__ or {})}.items()}
+        return _frozen_model_class(type(value)).model_construct(_fields_set=set(value.model_fields_set), **fields)
+    raise _Unfreezable(type(value).__name__)
+
+
+def _thaw(value: Any) -> Any:
+    """A hit's result: the top-level container is the caller's own, everything inside stays shared."""
+    if isinstance(value, _ReadOnlyList):
+        return list(value)
+    if isinstance(value, _ReadOnlyDict):
+        return dict(value)
+    return value
+
+
+def _normalize(value: Any) -> Hashable:
+    """Converts an argument into a hashable, order-insensitive-for-mappings key part."""
+    if isinstance(value, (str, int, float, bool, type(None))):
+        return (type(value).__name__, value)
+    if isinstance(value, dict):
+        return ("dict", tuple(sorted((str(k), _normalize(v)) for k, v in value.items())))
+    if isinstance(value, (list, tuple)):
+        return ("seq", tuple(_normalize(v) for v in value))
+    raise _Unhashable(type(value).__name__)
+
+
+def _argument_binder(signature: inspect.Signature) -> Callable[[tuple, dict], dict]:
+    """`signature.bind()` plus `apply_defaults()`, returning the arguments by name.
+
+    `Signature.bind` costs more than a cache hit should, so plain signatures
+    (positional-or-keyword and keyword-only parameters) are bound directly;
+    anything else falls back to it. Raises `TypeError` for calls that do not fit.
+    """
+    parameters = tuple(signature.parameters.values())
+    if any(p.kind not in (p.POSITIONAL_OR_KEYWORD, p.KEYWORD_ONLY) for p in parameters):
+        def bind(args: tuple, kwargs: dict) -> dict:
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            return bound.arguments
+        return bind
+
+    names = frozenset(signature.parameters)
+    positional = tuple(p.name for p in parameters if p.kind is p.POSITIONAL_OR_KEYWORD)
+    defaults = tuple((p.name, p.default) for p in parameters)
+
+    def bind(args: tuple, kwargs: dict) -> dict:
+        if len(args) > len(positional):
+            raise TypeError("too many positional arguments")
+        arguments = dict(zip(positional, args))
+        for param in kwargs:
+            if param in arguments or param not in names:
+                raise TypeError(f"unexpected or repeated argument {param!r}")
+        arguments.update(kwargs)
+        bound = {}
+        for param, default in defaults:
+            value = arguments.get(param, default)
+            if value is inspect.Parameter.empty:
+                raise TypeError(f"missing argument {param!r}")
+            bound[param] = value
+        return bound
+    return bind
+
+
+def estimate_size(value: Any) -> int:
+    """Rough payload size in bytes, dominated by text and base64 data fields."""
+    if isinstance(value, (str, bytes)):
+        return len(value)
+    if isinstance(value, (list, tuple)):
+        return sum(estimate_size(v) for v in value) + 8 * len(value)
+    if isinstance(value, dict):
+        return sum(estimate_size(k) + estimate_size(v) for k, v in value.items())
+    size = 0
+    for attr in ("text", "data", "content"):
+        part = getattr(value, attr, None)
+        if part is not None:
+            size += estimate_size(part)
+    return size or sys.getsizeof(value)
+
+
+class ResultCache:
+    """LRU cache for results of pure tools and prompts, bounded by entries and bytes.
+
+    Handlers opt in with `@cache.pure()`. The key is the handler name plus its
+    arguments after binding to the signature (defaults applied, `ctx` ignored),
+    so `add(a=1, b=2)` and `add(b=2, a=1)` share an entry. Calls whose
+    arguments cannot be normalized bypass the cache. A disabled cache returns
+    handlers unwrapped.
+
+    Entries are stored as read-only snapshots (`_freeze`), so a hit only copies
+    the top-level list or dict; nested values are shared and read-only. A miss returns the handler's
+    own result. Results that cannot be frozen are not cached.
+    """
+
+    def __init__(self, max_entries: int = 1024, max_bytes: int = 16 * 1024 * 1024, enabled: bool = True):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.enabled = enabled
+        self._entries: OrderedDict[Hashable, tuple[Any, int]] = OrderedDict()
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @classmethod
+    def from_env(cls) -> "ResultCache":
+        return cls(
+            max_entries=int(os.environ.get(RESULT_CACHE_ENTRIES_ENV_VAR, "1024")),
+            max_bytes=int(os.environ.get(RESULT_CACHE_BYTES_ENV_VAR, str(16 * 1024 * 1024))),
+            enabled=os.environ.get(RESULT_CACHE_ENV_VAR, "").lower() in ("1", "true", "yes", "on"),
+        )
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> tuple[bool, Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return False, None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return True, entry[0]
+
+    def put(self, key: Hashable, value: Any, size: int | None = None) -> None:
+        size = estimate_size(value) if size is None else size
+        if size > self.max_bytes:
+            return  # Would evict everything else and still not fit.
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self.total_bytes -= old[1]
+        self._entries[key] = (value, size)
+        self.total_bytes += size
+        while len(self._entries) > self.max_entries or self.total_bytes > self.max_bytes:
+            _, (_, evicted_size) = self._entries.popitem(last=False)
+            self.total_bytes -= evicted_size
+            self.evictions += 1
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.total_bytes = 0
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "enabled": int(self.enabled),
+            "entries": len(self._entries),
+            "bytes": self.total_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+    def pure(self) -> Callable:
+        """Declares a handler pure (result depends only on its arguments) and caches it."""
+        def decorator(func: Callable) -> Callable:
+            if not self.enabled:
+                return func
+            bind = _argument_binder(inspect.signature(func))
+            name = func.__qualname__
+
+            def make_key(args: tuple, kwargs: dict) -> Hashable | None:
+                try:
+                    return (name,) + tuple(
+                        (param, _normalize(value)) for param, value in bind(args, kwargs).items()
+                        if param not in _IGNORED_PARAMETERS
+                    )
+                except (TypeError, _Unhashable):
+                    return None
+
+            def store(key: Hashable, value: Any) -> None:
+                try:
+                    self.put(key, _freeze(value))
+                except _Unfreezable:
+                    pass
+
+            if inspect.iscoroutinefunction(func):
+                @functools.wraps(func)
+                async def async_wrapper(*args, **kwargs):
+                    key = make_key(args, kwargs)
+                    if key is None:
+                        return await func(*args, **kwargs)
+                    hit, value = self.get(key)
+                    if hit:
+                        return _thaw(value)
+                    value = await func(*args, **kwargs)
+                    store(key, value)
+                    return value
+                return async_wrapper
+
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                key = make_key(args, kwargs)
+                if key is None:
+                    return func(*args, **kwargs)
+                hit, value = self.get(key)
+                if hit:
+                    return _thaw(value)
+                value = func(*args, **kwargs)
+                store(key, value)
+                return value
+            return wrapper
+        return decorator
@@ -0,0 +1,222 @@
+import asyncio
+import inspect
+import math
+import random
+import sys
+from enum import Enum
+from typing import Callable
+
+
+class MissedTickPolicy(Enum):
+    SKIP = "skip"                # Drop missed runs and stay on the original cadence.
+    CATCH_UP = "catch_up"        # Run every missed tick, one per wheel tick, until caught up.
+    RESCHEDULE = "reschedule"    # Restart the cadence from the late run.
+
+
+class Job:
+    """A one-shot or periodic timer on a `TimerWheel`; use `cancel()` to stop it."""
+
+    __slots__ = ("name", "callback", "interval", "jitter", "policy", "due", "fire_at", "target_tick",
+                 "slot", "cancelled", "runs", "missed", "overruns", "max_drift", "total_drift",
+                 "_wheel", "_task")
+
+    def __init__(self, wheel: "TimerWheel", name: str, callback: Callable, interval: float | None, jitter: float, policy: MissedTickPolicy):
+        self._wheel = wheel
+        self.name = name
+        self.callback = callback
+        self.interval = interval
+        self.jitter = jitter
+        self.policy = policy
+        self.due = 0.0
+        self.fire_at = 0.0
+        self.target_tick = 0
+        self.slot: set | None = None
+        self.cancelled = False
+        self.runs = 0
+        self.missed = 0
+        self.overruns = 0
+        self.max_drift = 0.0
+        self.total_drift = 0.0
+        self._task: asyncio.Task | None = None
+
+    def cancel(self) -> None:
+        self._wheel.cancel(self)
+
+    def stats(self) -> dict:
+        return {
+            "name": self.name,
+            "interval": self.interval,
+            "runs": self.runs,
+            "missed": self.missed,
+            "overruns": self.overruns,
+            "max_drift_ms": self.max_drift * 1000,
+            "mean_drift_ms": (self.total_drift / self.runs * 1000) if self.runs else 0.0,
+        }
+
+
+class TimerWheel:
+    """Hashed timer wheel hosting many periodic and one-shot jobs on one task.
+
+    Time advances in `tick`-second steps; a job lands in slot
+    `target_tick % slots`, so scheduling and cancelling are O(1) and each tick
+    only looks at one slot. `run()` is the single driver task; it idles on an
+    event while no jobs are scheduled. Coroutine callbacks run as tasks, and a
+    periodic job whose previous run is still in progress skips the tick
+    (counted as an overrun). Firing is never earlier than due; lateness is
+    recorded as drift.
+    """
+
+    def __init__(self, tick: float = 0.01, slots: int = 512):
+        if tick <= 0 or slots < 1:
+            raise ValueError("tick must be positive and slots at least 1.")
+        self.tick = tick
+        self._slots: list[set[Job]] = [set() for _ in range(slots)]
+        self._start: float | None = None
+        self._tick_count = 0
+        self._job_count = 0
+        self._wakeup: asyncio.Event | None = None
+        self._running_tasks: set[asyncio.Task] = set()
+        self.jobs: set[Job] = set()
+        self.fired = 0
+        self.errors = 0
+
+    def _now(self) -> float:
+        return asyncio.get_running_loop().time()
+
+    def _ensure_started(self) -> None:
+        if self._start is None:
+            self._start = self._now()
+            self._wakeup = asyncio.Event()
+        elif self._job_count == 0:
+            # The wheel was idle and did not advance; resync so new targets stay ahead of the cursor.
+            self._tick_count = max(self._tick_count, int((self._now() - self._start) / self.tick))
+
+    def _place(self, job: Job) -> None:
+        target = max(self._tick_count + 1, math.ceil((job.fire_at - self._start) / self.tick))
+        job.target_tick = target
+        job.slot = self._slots[target % len(self._slots)]
+        job.slot.add(job)
+        self._job_count += 1
+        self._wakeup.set()
+
+    def _unplace(self, job: Job) -> None:
+        if job.slot is not None:
+            job.slot.discard(job)
+            job.slot = None
+            self._job_count -= 1
+
+    def _arm(self, job: Job, due: float) -> None:
+        job.due = due
+        job.fire_at = due + (random.uniform(0, job.jitter) if job.jitter else 0.0)
+        self._place(job)
+
+    def call_later(self, delay: float, callback: Callable, name: str | None = None) -> Job:
+        """Runs `callback` once after `delay` seconds."""
+        self._ensure_started()
+        job = Job(self, name or getattr(callback, "__name__", "job"), callback, None, 0.0, MissedTickPolicy.SKIP)
+        self.jobs.add(job)
+        self._arm(job, self._now() + max(delay, 0.0))
+        return job
+
+    def call_every(self, interval: float, callback: Callable, name: str | None = None, jitter: float = 0.0,
+                   policy: MissedTickPolicy = MissedTickPolicy.SKIP, first_delay: float | None = None) -> Job:
+        """Runs `callback` every `interval` seconds, each run delayed by up to `jitter` seconds."""
+        if interval <= 0:
+            raise ValueError(f"interval must be positive, got {interval}.")
+        self._ensure_started()
+        job = Job(self, name or getattr(callback, "__name__", "job"), callback, interval, jitter, policy)
+        self.jobs.add(job)
+        self._arm(job, self._now() + (interval if first_delay is None else max(first_delay, 0.0)))
+        return job
+
+    def cancel(self, job: Job) -> None:
+        if job.cancelled:
+            return
+        job.cancelled = True
+        self._unplace(job)
+        self.jobs.discard(job)
+        if job._task is not None and not job._task.done():
+            job._task.cancel()
+
+    def stats(self) -> dict:
+        drifts = [job.max_drift for job in self.jobs if job.runs]
+        return {
+            "jobs": len(self.jobs),
+            "fired": self.fired,
+            "errors": self.errors,
+            "running": len(self._running_tasks),
+            "max_drift_ms": max(drifts) * 1000 if drifts else 0.0,
+        }
+
+    def _on_task_done(self, task: asyncio.Task) -> None:
+        self._running_tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            self.errors += 1
+            print(f"[SERVER_LOG] Scheduled job {task.get_name()} failed: {task.exception()!r}", file=sys.stderr, flush=True)
+
+    def _fire(self, job: Job, now: float) -> None:
+        drift = max(0.0, now - job.fire_at)
+        job.max_drift = max(job.max_drift, drift)
+        job.total_drift += drift
+        if job._task is not None and not job._task.done():
+            job.overruns += 1
+        else:
+            job.runs += 1
+            self.fired += 1
+            try:
+                result = job.callback()
+            except Exception as e:
+                self.errors += 1
+                print(f"[SERVER_LOG] Scheduled job {job.name} failed: {e!r}", file=sys.stderr, flush=True)
+            else:
+                if inspect.isawaitable(result):
+                    job._task = asyncio.ensure_future(result)
+                    job._task.set_name(job.name)
+                    self._running_tasks.add(job._task)
+                    job._task.add_done_callback(self._on_task_done)
+
+        if job.interval is None:
+            self.jobs.discard(job)
+            job.cancelled = True
+            return
+        next_due = job.due + job.interval
+        if next_due <= now:
+            if job.policy is MissedTickPolicy.SKIP:
+                skipped = math.floor((now - next_due) / job.interval) + 1
+                job.missed += skipped
+                next_due += skipped * job.interval
+            elif job.policy is MissedTickPolicy.RESCHEDULE:
+                job.missed += 1
+                next_due = now + job.interval
+            # CATCH_UP keeps the overdue time; it fires on the next tick.
+        self._arm(job, next_due)
+
+    def _expire_slot(self, tick_number: int, now: float) -> None:
+        slot = self._slots[tick_number % len(self._slots)]
+        due_jobs = [job for job in slot if job.target_tick <= tick_number]
+        for job in due_jobs:
+            self._unplace(job)
+        for job in due_jobs:
+            if not job.cancelled:
+                self._fire(job, now)
+
+    async def run(self) -> None:
+        """Drives the wheel until cancelled, then cancels in-flight job runs."""
+        self._ensure_started()
+        try:
+            while True:
+                if self._job_count == 0:
+                    self._wakeup.clear()
+                    await self._wakeup.wait()
+                    continue
+                next_tick_at = self._start + (self._tick_count + 1) * self.tick
+                await asyncio.sleep(max(0.0, next_tick_at - self._now()))
+                now = self._now()
+                current_tick = int((now - self._start) / self.tick)
+                while self._tick_count < current_tick:
+                    self._tick_count += 1
+                    self._expire_slot(self._tick_count, now)
+        finally:
+            for task in list(self._running_tasks):
+                task.cancel()
+            await asyncio.gather(*self._running_tasks, return_exceptions=True)
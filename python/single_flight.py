@@ -0,0 +1,152 @@
+import asyncio
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Hashable
+
+SINGLE_FLIGHT_ENV_VAR = "MCP_SAMPLING_SINGLE_FLIGHT"
+SAMPLING_CACHE_TTL_ENV_VAR = "MCP_SAMPLING_CACHE_TTL"
+SAMPLING_TIMEOUT_ENV_VAR = "MCP_SAMPLING_TIMEOUT"
+
+
+class _Flight:
+    __slots__ = ("task", "waiters")
+
+    def __init__(self, task: asyncio.Task):
+        self.task = task
+        self.waiters = 0
+
+
+class SingleFlight:
+    """Runs at most one request per key at a time and shares its result.
+
+    `do(key, fn)` starts `fn()` as a task unless a call with the same key is
+    already in flight, in which case it joins that call. Each caller waits at
+    most `timeout` seconds, and the shared task is cancelled once its last
+    caller times out or is cancelled, so abandoned requests do not linger.
+    Successful results are kept for `ttl` seconds (0 disables the cache, up to
+    `max_entries`); failures are never cached. With `enabled=False` every call
+    runs on its own, but timeouts, cancellation and latency stats still apply.
+    """
+
+    def __init__(self, timeout: float | None = 60.0, ttl: float = 0.0, max_entries: int = 256, enabled: bool = True):
+        if ttl < 0 or max_entries < 1:
+            raise ValueError(f"Invalid cache settings: ttl={ttl}, max_entries={max_entries}.")
+        self.timeout = timeout
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.enabled = enabled
+        self._flights: dict[Hashable, _Flight] = {}
+        self._cache: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self.calls = 0
+        self.executions = 0
+        self.shared = 0
+        self.cache_hits = 0
+        self.timeouts = 0
+        self.cancelled = 0
+        self.errors = 0
+        self.in_flight = 0
+        self.latency_sum = 0.0
+        self.latency_max = 0.0
+
+    @classmethod
+    def from_env(cls) -> "SingleFlight":
+        timeout = float(os.environ.get(SAMPLING_TIMEOUT_ENV_VAR, "60"))
+        return cls(
+            timeout=timeout if timeout > 0 else None,
+            ttl=float(os.environ.get(SAMPLING_CACHE_TTL_ENV_VAR, "0")),
+            enabled=os.environ.get(SINGLE_FLIGHT_ENV_VAR, "").lower() in ("1", "true", "yes", "on"),
+        )
+
+    def _cached(self, key: Hashable) -> tuple[bool, Any]:
+        entry = self._cache.get(key)
+        if entry is None:
+            return False, None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._cache[key]
+            return False, None
+        return True, value
+
+    def _store(self, key: Hashable, value: Any) -> None:
+        self._cache[key] = (time.monotonic() + self.ttl, value)
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.max_entries:
+            self._cache.popitem(last=False)
+
+    async def _execute(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        self.in_flight += 1
+        started = time.perf_counter()
+        try:
+            result = await fn()
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            self.errors += 1
+            raise
+        finally:
+            self.in_flight -= 1
+            elapsed = time.perf_counter() - started
+            self.latency_sum += elapsed
+            self.latency_max = max(self.latency_max, elapsed)
+        if self.enabled and self.ttl > 0:
+            self._store(key, result)
+        return result
+
+    def _forget(self, key: Hashable, flight: _Flight) -> None:
+        if self._flights.get(key) is flight:
+            del self._flights[key]
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """Returns the result of `fn()`, shared with concurrent calls under the same key.
+
+        Raises `TimeoutError` if no result arrives within `timeout` seconds.
+        """
+        self.calls += 1
+        if self.enabled and self.ttl > 0:
+            hit, value = self._cached(key)
+            if hit:
+                self.cache_hits += 1
+                return value
+
+        flight = self._flights.get(key) if self.enabled else None
+        if flight is None:
+            flight = _Flight(asyncio.ensure_future(self._execute(key, fn)))
+            self.executions += 1
+            if self.enabled:
+                self._flights[key] = flight
+                # A done callback, not a finally block: a task cancelled before its first step never runs one.
+                flight.task.add_done_callback(lambda _: self._forget(key, flight))
+        else:
+            self.shared += 1
+
+        flight.waiters += 1
+        try:
+            # shield() so one caller giving up does not cancel the request for the others.
+            return await asyncio.wait_for(asyncio.shield(flight.task), self.timeout)
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            raise TimeoutError(f"Request timed out after {self.timeout} seconds.") from None
+        finally:
+            flight.waiters -= 1
+            if flight.waiters == 0 and not flight.task.done():
+                # Forget it first, so a caller arriving before the task finishes cancelling starts afresh.
+                self._forget(key, flight)
+                flight.task.cancel()
+                self.cancelled += 1
+
+    def stats(self) -> dict:
+        return {
+            "enabled": int(self.enabled),
+            "calls": self.calls,
+            "executions": self.executions,
+            "shared": self.shared,
+            "cache_hits": self.cache_hits,
+            "cache_entries": len(self._cache),
+            "in_flight": self.in_flight,
+            "timeouts": self.timeouts,
+            "cancelled": self.cancelled,
+            "errors": self.errors,
+            "latency_mean_ms": (self.latency_sum / self.executions * 1000) if self.executions else 0.0,
+            "latency_max_ms": self.latency_max * 1000,
+        }
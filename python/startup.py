@@ -0,0 +1,82 @@
+import argparse
+import asyncio
+import json
+import sys
+import time
+
+from mcp import StdioServerParameters
+from mcp.client.session import ClientSession
+from mcp.client.stdio import stdio_client
+
+from benchmark import PYTHON_DIR, percentile
+
+DEFAULT_BUDGET_MS = 2000.0
+# Server-side phases reported in the "startup" metrics collector (see mcp_server.STARTUP_TIMINGS).
+SERVER_PHASES = ("import_ms", "setup_ms", "ready_ms")
+
+
+async def measure_cold_start() -> dict:
+    """Spawns one fresh `mcp_server.py` and returns its startup phases in milliseconds.
+
+    `initialize_ms` is measured here, from spawning the process to the
+    `initialize` response; the other phases come from the server's own metrics.
+    """
+    server_params = StdioServerParameters(command=sys.executable, args=["mcp_server.py"], cwd=PYTHON_DIR)
+    started = time.perf_counter()
+    async with stdio_client(server_params) as (reader, writer):
+        async with ClientSession(reader, writer) as session:
+            await session.initialize()
+            timings = {"initialize_ms": (time.perf_counter() - started) * 1000}
+            metrics_result = await session.read_resource("metrics://server")
+            snapshot = json.loads(metrics_result.contents[0].text)
+            server_timings = snapshot.get("collectors", {}).get("startup", {})
+            timings.update({phase: server_timings[phase] for phase in SERVER_PHASES if phase in server_timings})
+    return timings
+
+
+def summarize_startup(runs: list[dict]) -> dict:
+    """Per phase: p50 and max across runs."""
+    summary = {"runs": len(runs)}
+    for phase in ("initialize_ms",) + SERVER_PHASES:
+        values = sorted(run[phase] for run in runs if phase in run)
+        if values:
+            summary[phase] = {"p50": percentile(values, 50), "max": values[-1]}
+    return summary
+
+
+def check_budget(summary: dict, budget_ms: float) -> list[str]:
+    """Returns a description of the failure if the median cold start exceeds the budget."""
+    initialize = summary.get("initialize_ms")
+    if initialize is None:
+        return ["No successful cold start was measured."]
+    if initialize["p50"] > budget_ms:
+        return [f"Median time to initialize response {initialize['p50']:.1f} ms exceeds the {budget_ms:.1f} ms budget."]
+    return []
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Cold-start report and budget check for mcp_server.py.")
+    parser.add_argument("--runs", type=int, default=5, help="Number of fresh server processes to start.")
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS, help="Fail if the median time to the initialize response exceeds this.")
+    parser.add_argument("--output", help="Write JSON results to this file.")
+    args = parser.parse_args(argv)
+
+    runs = [asyncio.run(measure_cold_start()) for _ in range(args.runs)]
+    summary = summarize_startup(runs)
+    for phase, stats in summary.items():
+        if isinstance(stats, dict):
+            print(f"{phase:<14} p50={stats['p50']:8.1f}  max={stats['max']:8.1f}")
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"summary": summary, "runs": runs}, f, indent=2)
+    failures = check_budget(summary, args.budget_ms)
+    if failures:
+        for failure in failures:
+            print(failure, file=sys.stderr)
+        return 1
+    print(f"Cold start within the {args.budget_ms:.1f} ms budget.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,7 @@
+import pytest
+
+
+# The server modules are built on asyncio primitives, so async tests run on the asyncio backend only.
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
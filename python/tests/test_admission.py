@@ -0,0 +1,67 @@
+import asyncio
+import sys
+import pytest
+
+try:
+    from admission import AdmissionController, OverloadedError
+except ImportError:
+    import pathlib
+    PYTHON_DIR_PATH = str(pathlib.Path(__file__).parent.parent.resolve())
+    if PYTHON_DIR_PATH not in sys.path:
+        sys.path.insert(0, PYTHON_DIR_PATH)
+    from admission import AdmissionController, OverloadedError
+
+
+@pytest.mark.anyio
+async def test_per_tool_limit_queue_and_fast_rejection():
+    admission = AdmissionController(global_limit=10, global_queue=10)
+    release = asyncio.Event()
+    running = 0
+    peak = 0
+
+    @admission.limited(limit=2, max_queue=2, timeout=5)
+    async def expensive() -> str:
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await release.wait()
+        running -= 1
+        return "done"
+
+    calls = [asyncio.create_task(expensive()) for _ in range(4)]
+    await asyncio.sleep(0.01)
+    with pytest.raises(OverloadedError):
+        await expensive()  # 2 running + 2 queued: rejected without waiting.
+    stats = admission.stats()
+    assert stats["expensive_active"] == 2 and stats["expensive_queued"] == 2
+
+    release.set()
+    assert await asyncio.gather(*calls) == ["done"] * 4
+    assert peak == 2
+    stats = admission.stats()
+    assert stats["expensive_rejected"] == 1 and stats["expensive_admitted"] == 4
+    assert stats["expensive_active"] == 0 and stats["server_active"] == 0
+
+
+@pytest.mark.anyio
+async def test_wait_deadline_and_global_limit():
+    admission = AdmissionController(global_limit=1, global_queue=5, timeout=0.05)
+    hold = asyncio.Event()
+
+    @admission.limited(limit=5, max_queue=5)
+    async def first():
+        await hold.wait()
+
+    @admission.limited(limit=5, max_queue=5)
+    async def second():
+        return "ran"
+
+    holder = asyncio.create_task(first())
+    await asyncio.sleep(0.01)
+    with pytest.raises(OverloadedError):
+        await second()  # Blocked by the global limit until the deadline.
+    assert admission.stats()["server_timed_out"] == 1
+    assert admission.stats()["second_active"] == 0
+    hold.set()
+    await holder
+    assert await second() == "ran"
@@ -0,0 +1,91 @@
+import asyncio
+import inspect
+import json
+import sys
+import pydantic
+import pytest
+
+try:
+    from batch import encode_batch_results, run_batch
+except ImportError:
+    import pathlib
+    PYTHON_DIR_PATH = str(pathlib.Path(__file__).parent.parent.resolve())
+    if PYTHON_DIR_PATH not in sys.path:
+        sys.path.insert(0, PYTHON_DIR_PATH)
+    from batch import encode_batch_results, run_batch
+
+
+def validating_invoke(handlers: dict, ctx=None):
+    """Stand-in for the server's call_tool: validates arguments against the signature and injects ctx."""
+    async def invoke(name: str, arguments: dict):
+        handler = pydantic.validate_call(handlers[name])
+        if "ctx" in inspect.signature(handlers[name]).parameters:
+            arguments = {**arguments, "ctx": ctx}
+        result = handler(**arguments)
+        return await result if inspect.isawaitable(result) else result
+    return invoke
+
+
+@pytest.mark.anyio
+async def test_sub_calls_run_concurrently_and_return_in_input_order():
+    running = 0
+    peak = 0
+
+    async def slow_echo(message: str, ctx=None) -> str:
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        return f"Echo: {message} ({ctx})"
+
+    def add(a: int, b: int) -> str:
+        return f"The sum of {a} and {b} is {a + b}."
+
+    def broken() -> str:
+        raise ValueError("boom")
+
+    handlers = {"echo": slow_echo, "add": add, "broken": broken}
+    calls = [{"tool": "echo", "arguments": {"message": str(i)}} for i in range(20)]
+    calls += [{"tool": "add", "arguments": {"a": 1, "b": 2}}, {"tool": "broken"}, {"tool": "batch"}]
+    results = await run_batch(handlers, calls, validating_invoke(handlers, ctx="ctx"), max_concurrency=5)
+
+    assert peak == 5
+    assert [r["index"] for r in results] == list(range(23))
+    assert results[3]["result"] == "Echo: 3 (ctx)"
+    assert results[20]["result"] == "The sum of 1 and 2 is 3."
+    assert results[21]["error"] == "boom"
+    assert "non-batchable" in results[22]["error"]
+    assert json.loads(encode_batch_results(results))[20]["result"] == results[20]["result"]
+
+
+@pytest.mark.anyio
+async def test_bad_arguments_fail_only_their_own_call():
+    def add(a: int, b: int) -> str:
+        return f"The sum of {a} and {b} is {a + b}."
+
+    handlers = {"add": add}
+    calls = [
+        {"tool": "add", "arguments": {"a": "1", "b": "2"}},
+        {"tool": "add", "arguments": {"a": "one", "b": 2}},
+        {"tool": "add", "arguments": "oops"},
+        {"tool": "add", "arguments": {"a": 1}},
+        {"tool": "add", "arguments": {"a": 1, "b": 2, "ctx": "forged"}},
+        "not a call",
+        {"tool": "add", "arguments": {"a": 4, "b": 5}},
+    ]
+    results = await run_batch(handlers, calls, validating_invoke(handlers))
+
+    assert results[0]["result"] == "The sum of 1 and 2 is 3."  # Coerced by validation, not concatenated.
+    assert "validation error" in results[1]["error"]
+    assert "must be an object" in results[2]["error"]
+    assert "Invalid arguments" in results[3]["error"]
+    assert "Invalid arguments" in results[4]["error"]
+    assert "non-batchable" in results[5]["error"]
+    assert results[6]["result"] == "The sum of 4 and 5 is 9."
+
+
+@pytest.mark.anyio
+async def test_oversized_batches_are_rejected():
+    with pytest.raises(ValueError):
+        await run_batch({}, [{"tool": "echo"}] * 1001, validating_invoke({}))
@@ -0,0 +1,37 @@
+import sys
+import pytest
+
+try:
+    from benchmark import compare_to_baseline, parse_mix, percentile, summarize
+except ImportError:
+    import pathlib
+    PYTHON_DIR_PATH = str(pathlib.Path(__file__).parent.parent.resolve())
+    if PYTHON_DIR_PATH not in sys.path:
+        sys.path.insert(0, PYTHON_DIR_PATH)
+    from benchmark import compare_to_baseline, parse_mix, percentile, summarize
+
+
+def test_parse_mix():
+    assert parse_mix("echo=3, add") == {"echo": 3.0, "add": 1.0}
+    with pytest.raises(ValueError):
+        parse_mix("no_such_tool=1")
+    with pytest.raises(ValueError):
+        parse_mix("echo=0")
+
+
+def test_percentiles_use_nearest_rank():
+    values = [float(i) for i in range(1, 101)]
+    assert percentile(values, 50) == 50.0
+    assert percentile(values, 95) == 95.0
+    assert percentile(values, 99) == 99.0
+    assert percentile([], 50) == 0.0
+
+
+def test_baseline_comparison_flags_latency_and_throughput_regressions():
+    baseline = summarize({"echo": [0.001] * 100}, {}, elapsed=1.0)
+    same = summarize({"echo": [0.001] * 100}, {}, elapsed=1.0)
+    slower = summarize({"echo": [0.002] * 50}, {}, elapsed=1.0)
+    assert compare_to_baseline(same, baseline, tolerance=0.1) == []
+    regressions = compare_to_baseline(slower, baseline, tolerance=0.1)
+    assert any("p95_ms" in r for r in regressions)
+    assert any("throughput_rps" in r for r in regressions)
@@ -0,0 +1,39 @@
+import sys
+
+try:
+    from completion_index import CompletionRegistry, IntegerRangeSource, PrefixIndex
+except ImportError:
+    import pathlib
+    PYTHON_DIR_PATH = str(pathlib.Path(__file__).parent.parent.resolve())
+    if PYTHON_DIR_PATH not in sys.path:
+        sys.path.insert(0, PYTHON_DIR_PATH)
+    from completion_index import CompletionRegistry, IntegerRangeSource, PrefixIndex
+
+
+def test_prefix_index_is_case_insensitive_and_counts_all_matches():
+    index = PrefixIndex(["casual", "formal", "Friendly", "technical", "friend"])
+    assert index.search("F", 10) == (["formal", "friend", "Friendly"], 3)
+    assert index.search("fri", 1) == (["friend"], 2)
+    assert index.search("zzz", 10) == ([], 0)
+    assert index.search("", 2) == (["casual", "formal"], 5)
+
+
+def test_integer_range_source_matches_brute_force():
+    source = IntegerRangeSource(1234)
+    for prefix in ["", "1", "12", "123", "1234", "2", "99", "0", "x"]:
+        expected = [str(i) for i in range(1, 1235) if str(i).startswith(prefix)]
+        values, total = source.search(prefix, 5)
+        assert total == len(expected)
+        assert values == sorted(expected, key=int)[:5]
+
+
+def test_registry_reports_has_more():
+    registry = CompletionRegistry(max_values=100)
+    registry.register("style", ["casual", "formal"])
+    registry.register("resourceId", IntegerRangeSource(1_000_000))
+    assert registry.complete("style", "c") == {"values": ["casual"], "has_more": False, "total": 1}
+    result = registry.complete("resourceId", "5")
+    assert len(result["values"]) == 100
+    assert result["total"] == 111_111
+    assert result["has_more"] is True
+    assert registry.complete("unknown", "a") == {"values": [], "has_more": False, "total": 0}
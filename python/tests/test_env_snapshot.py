@@ -0,0 +1,38 @@
+import json
+import os
+import sys
+import pytest
+
+try:
+    from env_snapshot import EnvironmentSnapshot
+except ImportError:
+    import pathlib
+    PYTHON_DIR_PATH = str(pathlib.Path(__file__).parent.parent.resolve())
+    if PYTHON_DIR_PATH not in sys.path:
+        sys.path.insert(0, PYTHON_DIR_PATH)
+    from env_snapshot import EnvironmentSnapshot
+
+
+def test_encodings_are_cached_until_the_environment_changes(monkeypatch):
+    monkeypatch.setenv("SNAPSHOT_TEST_A", "1")
+    monkeypatch.setenv("SNAPSHOT_TEST_B", "2")
+    snapshot = EnvironmentSnapshot()
+
+    full = snapshot.encode()
+    assert json.loads(full) == dict(os.environ)
+    assert snapshot.encode() is full
+    filtered = snapshot.encode(prefix="SNAPSHOT_TEST_", compact=True)
+    assert filtered == '{"SNAPSHOT_TEST_A":"1","SNAPSHOT_TEST_B":"2"}'
+    assert json.loads(snapshot.encode(pattern=r"TEST_B$")) == {"SNAPSHOT_TEST_B": "2"}
+    assert snapshot.stats()["rebuilds"] == 1 and snapshot.stats()["hits"] == 1
+
+    monkeypatch.setenv("SNAPSHOT_TEST_B", "changed")
+    assert json.loads(snapshot.encode(prefix="SNAPSHOT_TEST_"))["SNAPSHOT_TEST_B"] == "changed"
+    monkeypatch.delenv("SNAPSHOT_TEST_A")
+    assert "SNAPSHOT_TEST_A" not in json.loads(snapshot.encode())
+    assert snapshot.stats()["rebuilds"] == 3
+
+
+def test_invalid_pattern_is_rejected():
+    with pytest.raises(ValueError):
+        EnvironmentSnapshot().encode(pattern="(")
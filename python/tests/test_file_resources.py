@@ -0,0 +1,67 @@
+import base64
+import pathlib
+import sys
+import pytest
+
+try:
+    from file_resources import FileResourceProvider
+except ImportError:
+    PYTHON_DIR_PATH = str(pathlib.Path(__file__).parent.parent.resolve())
+    if PYTHON_DIR_PATH not in sys.path:
+        sys.path.insert(0, PYTHON_DIR_PATH)
+    from file_resources import FileResourceProvider
+
+
+@pytest.fixture
+def provider(tmp_path):
+    (tmp_path / "data.bin").write_bytes(bytes(range(256)) * 40)  # 10240 bytes
+    (tmp_path / "empty.txt").write_bytes(b"")
+    (tmp_path / "subdir").mkdir()
+    return FileResourceProvider(str(tmp_path), chunk_size=3000, max_read=4096)
+
+
+def test_range_reads_return_only_the_requested_slice(provider):
+    resource = provider.read_range("data.bin", 250, 10)
+    assert base64.b64decode(resource["blob"]) == bytes([250, 251, 252, 253, 254, 255, 0, 1, 2, 3])
+    assert resource["size"] == 10240 and resource["length"] == 10
+    assert provider.read_range("data.bin", 10240, 10)["length"] == 0
+    assert provider.read_range("empty.txt", 0, 10)["blob"] == ""
+    with pytest.raises(ValueError):
+        provider.read_range("data.bin", 0, 5000)
+
+
+def test_chunks_concatenate_to_the_whole_file(provider):
+    chunks = provider.describe("data.bin")["chunks"]
+    assert chunks == 4
+    blobs = "".join(provider.read_chunk("data.bin", i)["blob"] for i in range(chunks))
+    assert base64.b64decode(blobs) == bytes(range(256)) * 40
+    with pytest.raises(ValueError):
+        provider.read_whole("data.bin")
+
+
+def test_names_cannot_escape_the_root(provider):
+    for name in ["../secret", "subdir", "missing.bin", "", ".."]:
+        with pytest.raises(ValueError):
+            provider.read_range(name, 0, 1)
+
+
+def test_listing_pages_over_files_only(provider):
+    page, next_index = provider.list_page(0, 1)
+    assert [r["name"] for r in page] == ["data.bin"] and next_index == 1
+    page, next_index = provider.list_page(1, 1)
+    assert [r["name"] for r in page] == ["empty.txt"] and next_index is None
+
+
+def test_escaping_symlinks_are_left_out_of_listings(provider, tmp_path_factory):
+    outside = tmp_path_factory.mktemp("outside") / "secret.txt"
+    outside.write_bytes(b"secret")
+    (pathlib.Path(provider.root) / "link.txt").symlink_to(outside)
+    page, next_index = provider.list_page(0, 10)
+    assert [r["name"] for r in page] == ["data.bin", "empty.txt"] and next_index is None
+    with pytest.raises(ValueError):
+        provider.read_whole("link.txt")
+
+
+def test_chunk_size_must_be_a_multiple_of_three(tmp_path):
+    with pytest.raises(ValueError):
+        FileResourceProvider(str(tmp_path), chunk_size=1000, max_read=4096)
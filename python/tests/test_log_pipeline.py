@@ -0,0 +1,73 @@
+import asyncio
+import sys
+import time
+import pytest
+
+try:
+    from log_pipeline import LogPipeline
+except ImportError:
+    import pathlib
+    PYTHON_DIR_PATH = str(pathlib.Path(__file__).parent.parent.resolve())
+    if PYTHON_DIR_PATH not in sys.path:
+        sys.path.insert(0, PYTHON_DIR_PATH)
+    from log_pipeline import LogPipeline
+
+
+def test_submit_filters_by_level_and_drops_oldest_on_overflow():
+    pipeline = LogPipeline(level="warning", capacity=2)
+    assert pipeline.submit("info", "ignored") is False
+    for i in range(3):
+        pipeline.submit("error", f"error {i}")
+    assert pipeline.stats()["filtered"] == 1
+    assert pipeline.stats()["dropped"] == 1
+    assert [data for _, _, data in pipeline._buffer] == ["error 1", "error 2"]
+    assert pipeline.submit("CRITICAL", "upper-case level") is True
+    assert pipeline._buffer[-1][1] == "critical"
+    with pytest.raises(ValueError):
+        pipeline.set_level("verbose")
+
+
+@pytest.mark.anyio
+async def test_run_respects_rate_cap_and_level_changes():
+    pipeline = LogPipeline(level="debug", capacity=1000, max_rate=200, batch_size=20)
+    sent = []
+
+    async def send(level, data, logger):
+        sent.append((level, data))
+
+    for i in range(60):
+        pipeline.submit("error", i)
+    pipeline.submit("debug", "queued before the level was raised")
+    pipeline.set_level("error")
+
+    started = time.monotonic()
+    runner = asyncio.create_task(pipeline.run(send))
+    while pipeline.sent < 60:
+        await asyncio.sleep(0.005)
+    elapsed = time.monotonic() - started
+    await asyncio.sleep(0.02)
+    runner.cancel()
+    await asyncio.gather(runner, return_exceptions=True)
+
+    # 20 go out immediately from the burst, the other 40 need ~0.2s at 200/s.
+    assert elapsed >= 0.15
+    assert [data for _, data in sent] == list(range(60))
+    assert pipeline.filtered == 1
+
+
+@pytest.mark.anyio
+async def test_messages_reaching_no_recipient_are_not_counted_as_sent():
+    pipeline = LogPipeline(level="debug")
+    recipients = [0, 2]
+
+    async def send(level, data, logger):
+        return recipients.pop(0)
+
+    pipeline.submit("info", "nobody listening")
+    pipeline.submit("info", "two sessions")
+    runner = asyncio.create_task(pipeline.run(send))
+    while pipeline.sent + pipeline.undelivered < 2:
+        await asyncio.sleep(0.005)
+    runner.cancel()
+    await asyncio.gather(runner, return_exceptions=True)
+    assert (pipeline.stats()["sent"], pipeline.stats()["undelivered"]) == (1, 1)
@@ -9,15 +9,16 @@ from mcp.client.session import ClientSession
 # Assuming mcp_client.py and mcp_server.py are in the parent directory of 'tests'
 # when pytest is run from the 'python' directory.
 try:
-    from mcp_client import call_echo_tool
+    from mcp_client import ServerPool, call_echo_tool, connect_in_process, iter_batch
 except ImportError:
     import pathlib
     PYTHON_DIR_PATH = str(pathlib.Path(__file__).parent.parent.resolve())
     if PYTHON_DIR_PATH not in sys.path:
         sys.path.insert(0, PYTHON_DIR_PATH)
-    from mcp_client import call_echo_tool
+    from mcp_client import ServerPool, call_echo_tool, connect_in_process, iter_batch
 
 @pytest.mark.anyio
+@pytest.mark.parametrize("anyio_backend", ["asyncio", "trio"])
 async def test_successful_echo():
     print("[TEST_ENTRY_LOG] test_successful_echo function started.", flush=True)
     """
@@ -60,3 +61,126 @@ async def test_successful_echo():
 
     assert actual_response == expected_response, \
         f"Echo tool did not return the expected response. Expected: '{expected_response}', Got: '{actual_response}'"
+
+
+@pytest.mark.anyio
+async def test_successful_echo_in_process():
+    """
+    Same as test_successful_echo, but against a server created in this process
+    and connected over memory streams instead of a stdio subprocess.
+    """
+    from mcp_server import create_server
+
+    test_message = "Pytest says hello to the in-process echo tool!"
+    async with connect_in_process(create_server()) as session:
+        actual_response = await call_echo_tool(session, test_message)
+
+    assert actual_response == f"Echo: {test_message}"
+
+
+@pytest.mark.anyio
+async def test_server_pool_leases_and_recycles_sessions():
+    """
+    Leases more sessions than the pool holds and checks that servers are
+    recycled once they reach max_requests.
+    """
+    python_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    server_params = StdioServerParameters(command=sys.executable, args=["mcp_server.py"], cwd=python_dir)
+
+    async with ServerPool(size=2, server_params=server_params, max_requests=2) as pool:
+        async def leased_echo(i: int) -> str:
+            async with pool.lease() as session:
+                return await call_echo_tool(session, f"pooled {i}")
+
+        responses = await asyncio.gather(*(leased_echo(i) for i in range(6)))
+        stats = pool.stats()
+
+    assert responses == [f"Echo: pooled {i}" for i in range(6)]
+    assert stats["leases"] == 6
+    assert stats["recycled"] >= 2
+
+
+@pytest.mark.anyio
+async def test_iter_batch_pipelines_within_window():
+    """
+    Drives iter_batch against a stand-in session and checks the in-flight window,
+    completion-order delivery and per-call error reporting.
+    """
+    class FakeSession:
+        in_flight = 0
+        peak = 0
+
+        async def call_tool(self, name, arguments):
+            FakeSession.in_flight += 1
+            FakeSession.peak = max(FakeSession.peak, FakeSession.in_flight)
+            await asyncio.sleep(0.001 * (10 - arguments["i"] % 10))
+            FakeSession.in_flight -= 1
+            if name == "fail":
+                raise RuntimeError("tool failed")
+            return arguments["i"]
+
+        async def read_resource(self, uri):
+            return uri
+
+    calls = [{"tool": "echo", "arguments": {"i": i}} for i in range(50)]
+    calls += [{"tool": "fail", "arguments": {"i": 0}}, {"resource": "test://static/resource/1"}]
+    results = [item async for item in iter_batch(FakeSession(), iter(calls), window=8)]
+
+    assert FakeSession.peak == 8
+    assert sorted(index for index, _ in results) == list(range(52))
+    assert [index for index, _ in results] != list(range(52))  # Completion order, not submission order.
+    by_index = dict(results)
+    assert by_index[7] == 7
+    assert isinstance(by_index[50], RuntimeError)
+    assert by_index[51] == "test://static/resource/1"
+
+
+@pytest.mark.anyio
+async def test_server_pool_surfaces_spawn_failures_and_lease_timeouts():
+    """
+    Points the pool at a missing executable: once the bounded respawns give up the
+    waiting lease gets the spawn error, and a lease with nothing to wait for times out.
+    """
+    server_params = StdioServerParameters(command=os.path.join(os.path.dirname(__file__), "no-such-server"), args=[])
+
+    async with ServerPool(size=1, server_params=server_params, respawn_delay=0.01, max_respawn_attempts=2) as pool:
+        with pytest.raises(RuntimeError, match="could not be started") as excinfo:
+            async with pool.lease():
+                pass
+        assert isinstance(excinfo.value.__cause__, OSError)
+        assert pool.stats()["spawn_failures"] == 1
+
+    async with ServerPool(size=1, server_params=server_params, respawn_delay=60, lease_timeout=0.05) as pool:
+        with pytest.raises(TimeoutError):
+            async with pool.lease():
+                pass
+
+
+@pytest.mark.anyio
+async def test_server_pool_close_during_respawn_leaves_no_child(tmp_path):
+    """
+    A stand-in server that never answers `initialize` keeps the respawn waiting;
+    closing the pool then must shut that half-started process down.
+    """
+    pid_file = tmp_path / "server.pid"
+    server_params = StdioServerParameters(command=sys.executable, args=[
+        "-c", f"import os, sys, time; open({str(pid_file)!r}, 'w').write(str(os.getpid())); sys.stdin.read(); time.sleep(60)",
+    ])
+    pool = ServerPool(size=1, server_params=server_params)
+    pool._respawn_later()
+    for _ in range(200):
+        if pid_file.exists() and pid_file.read_text():
+            break
+        await asyncio.sleep(0.05)
+    pid = int(pid_file.read_text())
+
+    await pool.close()
+    for _ in range(100):
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            break
+        await asyncio.sleep(0.05)
+    else:
+        pytest.fail(f"Pooled server process {pid} is still running after close().")
+    assert pool.stats()["spawning"] == 0 and not pool._members
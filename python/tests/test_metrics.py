@@ -0,0 +1,49 @@
+import inspect
+import sys
+import pytest
+
+try:
+    from metrics import MetricsRegistry
+except ImportError:
+    import pathlib
+    PYTHON_DIR_PATH = str(pathlib.Path(__file__).parent.parent.resolve())
+    if PYTHON_DIR_PATH not in sys.path:
+        sys.path.insert(0, PYTHON_DIR_PATH)
+    from metrics import MetricsRegistry
+
+
+@pytest.mark.anyio
+async def test_instrument_counts_calls_errors_and_keeps_signature():
+    metrics = MetricsRegistry()
+
+    @metrics.instrument("tool")
+    def add(a: int, b: int) -> str:
+        return f"{a + b}"
+
+    @metrics.instrument("tool")
+    async def fail(message: str, ctx=None) -> str:
+        raise ValueError(message)
+
+    assert add(1, 2) == "3"
+    with pytest.raises(ValueError):
+        await fail("boom")
+
+    assert list(inspect.signature(add).parameters) == ["a", "b"]
+    assert inspect.iscoroutinefunction(fail)
+    handlers = {h["name"]: h for h in metrics.snapshot()["handlers"]}
+    assert handlers["add"]["calls"] == 1 and handlers["add"]["errors"] == 0
+    assert handlers["fail"]["calls"] == 1 and handlers["fail"]["errors"] == 1
+    assert handlers["add"]["in_flight"] == 0
+
+
+def test_prometheus_output_includes_histograms_and_collectors():
+    metrics = MetricsRegistry()
+    metrics.register_collector("resource_notifier", lambda: {"sent": 5, "label": "ignored"})
+    echo = metrics.instrument("tool")(lambda message: message)
+    echo("hi")
+
+    text = metrics.to_prometheus()
+    assert 'mcp_handler_calls_total{kind="tool",name="<lambda>"} 1' in text
+    assert 'mcp_handler_latency_seconds_bucket{kind="tool",name="<lambda>",le="+Inf"} 1' in text
+    assert "mcp_resource_notifier_sent 5" in text
+    assert "label" not in text
@@ -0,0 +1,64 @@
+import asyncio
+import os
+import sys
+import pytest
+
+try:
+    from multi_worker import WorkerSupervisor
+except ImportError:
+    import pathlib
+    PYTHON_DIR_PATH = str(pathlib.Path(__file__).parent.parent.resolve())
+    if PYTHON_DIR_PATH not in sys.path:
+        sys.path.insert(0, PYTHON_DIR_PATH)
+    from multi_worker import WorkerSupervisor
+
+
+def whoami_app(index: int):
+    """Worker app for the tests: answers every request with the worker index, pid and path."""
+    async def app(scope, receive, send):
+        if scope["type"] != "http":
+            return
+        body = f"{index} {os.getpid()} {scope['path']}".encode()
+        await send({"type": "http.response.start", "status": 200,
+                    "headers": [(b"content-type", b"text/plain"), (b"content-length", str(len(body)).encode())]})
+        await send({"type": "http.response.body", "body": body})
+    return app
+
+
+async def http_get(host: str, port: int, path: str) -> tuple[bytes, str]:
+    reader, writer = await asyncio.open_connection(host, port)
+    writer.write(f"GET {path} HTTP/1.1\r\nHost: {host}\r\n\r\n".encode())
+    await writer.drain()
+    response = await asyncio.wait_for(reader.read(), timeout=10)  # Workers close after one response.
+    writer.close()
+    head, _, body = response.partition(b"\r\n\r\n")
+    return head, body.decode()
+
+
+@pytest.mark.anyio
+async def test_supervisor_routes_connections_to_workers_and_shuts_them_down():
+    supervisor = WorkerSupervisor(2, host="127.0.0.1", port=0, app_factory=whoami_app)
+    serve_task = asyncio.create_task(supervisor.serve())
+    try:
+        while supervisor.address[1] == 0:
+            await asyncio.sleep(0.01)
+        host, port = supervisor.address
+
+        head, body = await http_get(host, port, "/w1/messages/?session_id=abc")
+        assert head.startswith(b"HTTP/1.1 200")
+        assert b"connection: close" in head.lower()
+        index, worker_pid, path = body.split(" ")
+        assert (index, path) == ("1", "/w1/messages/")
+        assert int(worker_pid) != os.getpid()
+
+        spread = {(await http_get(host, port, "/sse"))[1].split(" ")[0] for _ in range(4)}
+        assert spread == {"0", "1"}
+
+        head, _ = await http_get(host, port, "/w7/messages/")
+        assert head.startswith(b"HTTP/1.1 503")
+        assert supervisor.rejected == 1
+    finally:
+        serve_task.cancel()
+        await asyncio.gather(serve_task, return_exceptions=True)
+
+    assert all(not process.is_alive() for process in supervisor._processes)
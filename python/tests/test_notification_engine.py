@@ -0,0 +1,68 @@
+import asyncio
+import sys
+import pytest
+
+try:
+    from notification_engine import ResourceUpdateNotifier
+except ImportError:
+    import pathlib
+    PYTHON_DIR_PATH = str(pathlib.Path(__file__).parent.parent.resolve())
+    if PYTHON_DIR_PATH not in sys.path:
+        sys.path.insert(0, PYTHON_DIR_PATH)
+    from notification_engine import ResourceUpdateNotifier
+
+
+@pytest.mark.anyio
+async def test_updates_are_coalesced_and_sent_with_bounded_concurrency():
+    notifier = ResourceUpdateNotifier(interval=0, max_in_flight=4)
+    release = asyncio.Event()
+    in_flight = 0
+    peak_in_flight = 0
+    sent_uris = []
+
+    async def slow_send(uri: str) -> None:
+        nonlocal in_flight, peak_in_flight
+        in_flight += 1
+        peak_in_flight = max(peak_in_flight, in_flight)
+        await release.wait()
+        sent_uris.append(uri)
+        in_flight -= 1
+
+    uris = [f"test://static/resource/{i}" for i in range(1, 21)]
+    for uri in uris:
+        notifier.subscribe(uri)
+        notifier.mark_dirty(uri)
+    notifier.mark_dirty(uris[-1])
+    notifier.mark_dirty("test://not/subscribed")
+
+    runner = asyncio.create_task(notifier.run(slow_send))
+    await asyncio.sleep(0.01)
+    assert peak_in_flight == 4
+    release.set()
+    while notifier.sent < len(uris):
+        await asyncio.sleep(0.001)
+    runner.cancel()
+    await asyncio.gather(runner, return_exceptions=True)
+
+    assert sorted(sent_uris) == sorted(uris)
+    assert notifier.coalesced == 1
+    assert notifier.stats()["pending"] == 0
+
+
+@pytest.mark.anyio
+async def test_overflow_is_dropped_and_failures_are_counted():
+    notifier = ResourceUpdateNotifier(interval=0, max_pending=2)
+    for uri in ("a", "b", "c"):
+        notifier.subscribe(uri)
+        notifier.mark_dirty(uri)
+    assert notifier.dropped == 1
+
+    async def failing_send(uri: str) -> None:
+        raise RuntimeError("transport closed")
+
+    runner = asyncio.create_task(notifier.run(failing_send))
+    while notifier.failed < 2:
+        await asyncio.sleep(0.001)
+    runner.cancel()
+    await asyncio.gather(runner, return_exceptions=True)
+    assert notifier.sent == 0
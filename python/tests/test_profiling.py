@@ -0,0 +1,68 @@
+import os
+import sys
+import tracemalloc
+import pytest
+
+try:
+    from profiling import ProfilingSession
+except ImportError:
+    import pathlib
+    PYTHON_DIR_PATH = str(pathlib.Path(__file__).parent.parent.resolve())
+    if PYTHON_DIR_PATH not in sys.path:
+        sys.path.insert(0, PYTHON_DIR_PATH)
+    from profiling import ProfilingSession
+
+
+def busy_work() -> list:
+    return [str(i) * 10 for i in range(20_000)]
+
+
+@pytest.mark.anyio
+async def test_session_writes_cpu_and_memory_reports(tmp_path):
+    session = ProfilingSession(output_dir=str(tmp_path), top=5)
+    session.start(30, cpu=True, memory=True)
+    assert session.running
+    with pytest.raises(ValueError):
+        session.start(30)
+    kept = busy_work()
+    report = session.stop()
+
+    assert not session.running
+    assert not tracemalloc.is_tracing()  # Tracing started by the session is stopped again.
+    assert "busy_work" in report
+    assert "Memory: top 5 allocation sites" in report
+    assert session.latest_report == report
+    assert open(session.latest_report_path).read() == report
+    assert os.path.exists(session.latest_report_path[:-len(".txt")] + ".prof")
+    assert kept
+    with pytest.raises(ValueError):
+        session.stop()
+
+
+@pytest.mark.anyio
+async def test_existing_tracemalloc_traces_are_left_alone(tmp_path):
+    tracemalloc.start()
+    try:
+        before = busy_work()
+        traced_before = tracemalloc.get_traced_memory()[0]
+        session = ProfilingSession(output_dir=str(tmp_path))
+        session.start(30, cpu=False, memory=True)
+        during = busy_work()
+        report = session.stop()
+
+        assert tracemalloc.is_tracing()
+        assert tracemalloc.get_traced_memory()[0] >= traced_before  # Earlier traces were not cleared.
+        assert "by growth" in report
+        assert before and during
+    finally:
+        tracemalloc.stop()
+
+
+@pytest.mark.anyio
+async def test_invalid_start_arguments_are_rejected(tmp_path):
+    session = ProfilingSession(output_dir=str(tmp_path))
+    with pytest.raises(ValueError):
+        session.start(30, cpu=False, memory=False)
+    with pytest.raises(ValueError):
+        session.start(0)
+    assert not session.running
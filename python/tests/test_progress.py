@@ -0,0 +1,80 @@
+import sys
+import pytest
+
+try:
+    from progress import ProgressReporter, progress_setting_from_env
+except ImportError:
+    import pathlib
+    PYTHON_DIR_PATH = str(pathlib.Path(__file__).parent.parent.resolve())
+    if PYTHON_DIR_PATH not in sys.path:
+        sys.path.insert(0, PYTHON_DIR_PATH)
+    from progress import ProgressReporter, progress_setting_from_env
+
+
+@pytest.mark.anyio
+async def test_delta_throttle_coalesces_and_always_sends_final():
+    sent = []
+
+    async def send(current, total):
+        sent.append((current, total))
+
+    progress = ProgressReporter(send, 10_000, min_interval=0, min_delta=0.1)
+    for step in range(1, 10_000):
+        await progress.update(step)
+    await progress.finish()
+    assert len(sent) == 10
+    assert sent[0] == (1000, 10_000)
+    assert sent[-1] == (9999, 10_000)  # The coalesced final value, not the last threshold crossing.
+    await progress.finish()
+    assert len(sent) == 10  # Nothing new to deliver.
+
+
+@pytest.mark.anyio
+async def test_interval_throttle_sends_first_then_waits():
+    sent = []
+
+    async def send(current, total):
+        sent.append(current)
+
+    progress = ProgressReporter(send, 100, min_interval=60, min_delta=0)
+    for step in range(1, 101):
+        await progress.update(step)
+    await progress.finish()
+    assert sent == [1, 100]
+    assert progress.stats()["suppressed"] == 99
+
+
+@pytest.mark.anyio
+async def test_failed_send_stops_further_notifications():
+    async def send(current, total):
+        raise ConnectionError("client went away")
+
+    progress = ProgressReporter(send, 5, min_interval=0, min_delta=0)
+    await progress.update(1)
+    assert progress.cancelled
+    await progress.update(2)
+    await progress.finish()
+    assert progress.stats() == {"sent": 0, "suppressed": 0, "cancelled": 1}
+
+
+@pytest.mark.anyio
+async def test_zero_total_sends_nothing():
+    sent = []
+
+    async def send(current, total):
+        sent.append((current, total))
+
+    progress = ProgressReporter(send, 0)
+    await progress.finish()
+    assert sent == []
+
+
+def test_progress_settings_are_validated_when_read(monkeypatch):
+    monkeypatch.delenv("MCP_PROGRESS_TEST", raising=False)
+    assert progress_setting_from_env("MCP_PROGRESS_TEST", 0.1) == 0.1
+    monkeypatch.setenv("MCP_PROGRESS_TEST", "0")
+    assert progress_setting_from_env("MCP_PROGRESS_TEST", 0.1) == 0.0
+    for bad in ("-0.5", "nan", "fast"):
+        monkeypatch.setenv("MCP_PROGRESS_TEST", bad)
+        with pytest.raises(ValueError, match="MCP_PROGRESS_TEST"):
+            progress_setting_from_env("MCP_PROGRESS_TEST", 0.1)
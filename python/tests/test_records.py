@@ -0,0 +1,58 @@
+import base64
+import sys
+import pytest
+
+try:
+    from memory_benchmark import run_memory_benchmark
+    from records import AnnotationTemplate, PromptArgument, PromptRecord, ResourceRecord
+except ImportError:
+    import pathlib
+    PYTHON_DIR_PATH = str(pathlib.Path(__file__).parent.parent.resolve())
+    if PYTHON_DIR_PATH not in sys.path:
+        sys.path.insert(0, PYTHON_DIR_PATH)
+    from memory_benchmark import run_memory_benchmark
+    from records import AnnotationTemplate, PromptArgument, PromptRecord, ResourceRecord
+
+
+def test_records_are_immutable_and_slotted():
+    record = ResourceRecord("test://static/resource/2", "Resource 2", "application/octet-stream", blob=b"data")
+    with pytest.raises(AttributeError):
+        record.name = "changed"
+    with pytest.raises(AttributeError):
+        del record.uri
+    assert not hasattr(record, "__dict__")
+    with pytest.raises(ValueError):
+        ResourceRecord("test://static/resource/3", "Resource 3", "text/plain")
+
+
+def test_wire_forms_are_rendered_once_and_handed_out_as_copies():
+    record = ResourceRecord("test://static/resource/2", "Resource 2", "application/octet-stream", blob=b"data")
+    wire = record.wire()
+    assert wire["blob"] == base64.b64encode(b"data").decode("utf-8")
+    assert (wire["version"], wire["etag"]) == (0, '"2-0"')
+    wire["blob"] = "mutated"
+    again = record.wire()
+    assert again is not wire and again["blob"] == base64.b64encode(b"data").decode("utf-8")
+    assert again["etag"] is record.wire()["etag"]  # Rendered once, shared by every copy.
+    touched = record.with_version(3)
+    assert touched.wire()["etag"] == '"2-3"' and record.with_version(0) is record
+
+    prompt = PromptRecord("complex_prompt", "A prompt with arguments", (PromptArgument("style", "Output style"),))
+    listing = prompt.wire()
+    listing["name"] = "mutated"
+    with pytest.raises(TypeError):
+        listing["arguments"][0]["name"] = "mutated"
+    assert prompt.wire() is not listing and prompt.wire()["name"] == "complex_prompt"
+    assert prompt.wire()["arguments"] == ({"name": "style", "description": "Output style", "required": False},)
+
+    template = AnnotationTemplate("Error", 1.0, ("user", "assistant"))
+    template.annotations["priority"] = 0.0
+    assert template.annotations == {"priority": 1.0, "audience": ("user", "assistant")}
+
+
+def test_records_use_less_memory_than_dicts():
+    results = run_memory_benchmark(entries=5_000, calls=1_000)
+    assert results["resource_entry"]["saving"] > 0.1
+    assert results["resource_read_call"]["saving"] > 0.3
+    assert results["list_prompts_call"]["saving"] > 0.3
+    assert results["annotated_message_call"]["saving"] > 0.05
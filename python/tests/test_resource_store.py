@@ -0,0 +1,90 @@
+import sys
+import pytest
+
+try:
+    from records import ResourceRecord
+    from resource_store import ResourceStore
+except ImportError:
+    import pathlib
+    PYTHON_DIR_PATH = str(pathlib.Path(__file__).parent.parent.resolve())
+    if PYTHON_DIR_PATH not in sys.path:
+        sys.path.insert(0, PYTHON_DIR_PATH)
+    from records import ResourceRecord
+    from resource_store import ResourceStore
+
+FIXED = [ResourceRecord("test://static/resource/1", "Fixed", "text/plain", text="fixed")]
+
+
+def test_lookup_prefers_fixed_entries_and_generates_the_rest():
+    store = ResourceStore(1_000_000, fixed=FIXED)
+    assert store.get("1")["name"] == "Fixed"
+    assert store.get("3")["text"] == "Resource 3: This is a plaintext resource"
+    assert "blob" in store.get("1000000")
+    assert store.get("1000001") is None
+    assert store.get("0") is None
+    assert store.get("007") is None
+    assert store.get("abc") is None
+
+
+def test_pagination_walks_the_whole_catalog():
+    store = ResourceStore(25)
+    seen = []
+    cursor = None
+    while True:
+        page, cursor = store.list_page(cursor, 10)
+        seen.extend(r["uri"] for r in page)
+        if cursor is None:
+            break
+    assert seen == [f"test://static/resource/{i}" for i in range(1, 26)]
+
+
+def test_cursors_pin_the_snapshot_and_accept_plain_offsets():
+    store = ResourceStore(25)
+    page, cursor = store.list_page(None, 10)
+    store.resize(1000)  # Growth mid-listing does not extend this listing.
+    seen = [r["uri"] for r in page]
+    while cursor is not None:
+        page, cursor = store.list_page(cursor, 10)
+        seen.extend(r["uri"] for r in page)
+    assert len(seen) == 25
+    page, _ = store.list_page(ResourceStore.encode_cursor(990), 10)
+    assert [r["uri"] for r in page][-1] == "test://static/resource/1000"
+
+
+def test_versions_etags_and_changes_since():
+    store = ResourceStore(20, fixed=FIXED, change_log_size=4)
+    assert store.get("1")["version"] == 0
+    etag = store.get("3")["etag"]
+    assert store.touch("3") and store.touch("1")
+    assert not store.touch("21")
+    assert store.get("3")["version"] == 1 and store.get("3")["etag"] != etag
+    assert store.get("1")["name"] == "Fixed" and store.get("1")["version"] == 2
+
+    store.resize(22)
+    store.resize(18)
+    changes = store.changes_since(1)
+    assert changes["version"] == 4 and not changes["reset"]
+    assert [r["uri"] for r in changes["changed"]] == ["test://static/resource/1"]
+    assert changes["removed"] == [f"test://static/resource/{i}" for i in (19, 20, 21, 22)]
+    assert store.changes_since(4)["changed"] == []
+    assert store.changes_since(0, limit=3)["reset"]
+
+    store.touch("5")  # The log holds four changes, so version 0 is no longer answerable.
+    assert store.changes_since(0)["reset"]
+    assert not store.changes_since(1)["reset"]
+    with pytest.raises(ValueError):
+        store.changes_since(99)
+
+
+def test_invalid_cursor_is_rejected():
+    with pytest.raises(ValueError):
+        ResourceStore.decode_cursor("not a cursor")
+
+
+
+def test_entries_are_fresh_copies():
+    store = ResourceStore(10, fixed=FIXED)
+    store.get("1")["text"] = "mutated"
+    store.list_page(None, 5)[0][0]["name"] = "mutated"
+    assert store.get("1")["text"] == "fixed"
+    assert store.list_page(None, 5)[0][0]["name"] == "Fixed"
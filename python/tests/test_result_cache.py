@@ -0,0 +1,124 @@
+import sys
+import time
+import pytest
+from pydantic import BaseModel
+
+try:
+    from result_cache import ResultCache
+except ImportError:
+    import pathlib
+    PYTHON_DIR_PATH = str(pathlib.Path(__file__).parent.parent.resolve())
+    if PYTHON_DIR_PATH not in sys.path:
+        sys.path.insert(0, PYTHON_DIR_PATH)
+    from result_cache import ResultCache
+
+
+def test_pure_handler_is_keyed_on_normalized_arguments():
+    cache = ResultCache()
+    calls = []
+
+    @cache.pure()
+    def add(a: int, b: int = 0, ctx=None) -> str:
+        calls.append((a, b))
+        return f"{a + b}"
+
+    assert add(1, 2) == "3"
+    assert add(b=2, a=1, ctx=object()) == "3"
+    assert add(1) == "1"
+    assert add(1, b=0) == "1"
+    assert calls == [(1, 2), (1, 0)]
+    assert cache.stats()["hits"] == 2 and cache.stats()["misses"] == 2
+
+
+@pytest.mark.anyio
+async def test_async_results_are_cached_and_copied_out():
+    cache = ResultCache()
+
+    @cache.pure()
+    async def prompt(name: str, arguments: dict | None = None) -> dict:
+        return {"messages": [name, arguments]}
+
+    first = await prompt("p", {"x": "1", "y": "2"})
+    first["extra"] = True
+    first["messages"].append("injected")
+    first["messages"][1]["x"] = "changed"
+    second = await prompt("p", {"y": "2", "x": "1"})
+    assert "extra" not in second
+    assert second["messages"] == ["p", {"x": "1", "y": "2"}]
+    assert cache.hits == 1
+
+    # A hit owns only its top-level container; the shared nested values refuse changes.
+    second["extra"] = True
+    with pytest.raises(TypeError):
+        second["messages"].append("injected")
+    with pytest.raises(TypeError):
+        second["messages"][1]["x"] = "changed"
+    assert "extra" not in await prompt("p", {"x": "1", "y": "2"})
+
+
+class Part(BaseModel):
+    text: str
+    tags: list[str] = []
+
+
+def test_hits_share_frozen_parts_and_are_cheaper_than_misses():
+    cache = ResultCache()
+
+    @cache.pure()
+    def parts(n: int) -> list:
+        return [Part(text=f"part {i}", tags=["a", "b"]) for i in range(n)]
+
+    def best_of(call, repeat=200):
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            call()
+            timings.append(time.perf_counter() - started)
+        return min(timings)
+
+    miss = best_of(lambda: (cache.clear(), parts(3)))
+    hit = best_of(lambda: parts(3))
+    assert hit < miss
+
+    cached = parts(3)
+    assert isinstance(cached[0], Part) and cached[0].model_dump() == {"text": "part 0", "tags": ["a", "b"]}
+    cached.append(Part(text="mine"))
+    with pytest.raises(Exception):
+        cached[0].text = "changed"
+    with pytest.raises(TypeError):
+        cached[0].tags.append("c")
+    assert len(parts(3)) == 3 and parts(3)[0].tags == ["a", "b"]
+
+
+def test_unfreezable_results_are_not_cached():
+    cache = ResultCache()
+
+    @cache.pure()
+    def make(name: str) -> object:
+        return object()
+
+    assert make("x") is not make("x")
+    assert len(cache) == 0
+
+
+def test_lru_eviction_by_entries_and_bytes():
+    cache = ResultCache(max_entries=2, max_bytes=10)
+    cache.put("a", "1234")
+    cache.put("b", "1234")
+    cache.get("a")
+    cache.put("c", "1234")  # Entry bound: evicts least recently used "b".
+    assert cache.get("b") == (False, None)
+    cache.put("d", "12345678")  # Byte bound: needs to evict down to 10 bytes.
+    assert len(cache) == 1 and cache.total_bytes == 8
+    cache.put("huge", "x" * 11)
+    assert cache.get("huge") == (False, None)
+    assert cache.evictions == 3
+
+
+def test_disabled_cache_returns_handler_unwrapped():
+    cache = ResultCache(enabled=False)
+
+    def echo(message: str) -> str:
+        return message
+
+    assert cache.pure()(echo) is echo
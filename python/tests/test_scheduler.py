@@ -0,0 +1,75 @@
+import asyncio
+import sys
+import time
+import pytest
+
+try:
+    from scheduler import MissedTickPolicy, TimerWheel
+except ImportError:
+    import pathlib
+    PYTHON_DIR_PATH = str(pathlib.Path(__file__).parent.parent.resolve())
+    if PYTHON_DIR_PATH not in sys.path:
+        sys.path.insert(0, PYTHON_DIR_PATH)
+    from scheduler import MissedTickPolicy, TimerWheel
+
+
+@pytest.mark.anyio
+async def test_periodic_and_one_shot_jobs_share_one_driver():
+    wheel = TimerWheel(tick=0.005, slots=8)
+    periodic_runs = []
+    one_shot_runs = []
+    async_runs = []
+
+    async def async_job():
+        async_runs.append(1)
+
+    wheel.call_every(0.02, lambda: periodic_runs.append(1), name="periodic", jitter=0.005)
+    wheel.call_later(0.03, lambda: one_shot_runs.append(1))
+    wheel.call_every(0.02, async_job)
+    cancelled = wheel.call_every(0.01, lambda: pytest.fail("cancelled job ran"))
+    cancelled.cancel()
+
+    driver = asyncio.create_task(wheel.run())
+    await asyncio.sleep(0.13)
+    driver.cancel()
+    await asyncio.gather(driver, return_exceptions=True)
+
+    assert 4 <= len(periodic_runs) <= 7
+    assert one_shot_runs == [1]
+    assert len(async_runs) >= 4
+    assert wheel.stats()["jobs"] == 2
+    assert wheel.errors == 0
+
+
+@pytest.mark.anyio
+async def test_missed_tick_policies():
+    wheel = TimerWheel(tick=0.005)
+    skip = wheel.call_every(0.01, lambda: None, policy=MissedTickPolicy.SKIP)
+    catch_up = wheel.call_every(0.01, lambda: None, policy=MissedTickPolicy.CATCH_UP)
+    driver = asyncio.create_task(wheel.run())
+    await asyncio.sleep(0.005)
+    time.sleep(0.055)  # Block the loop so roughly five ticks are missed.
+    await asyncio.sleep(0.03)
+    driver.cancel()
+    await asyncio.gather(driver, return_exceptions=True)
+
+    assert skip.missed >= 3
+    assert catch_up.missed == 0
+    assert catch_up.runs > skip.runs
+    assert skip.stats()["max_drift_ms"] >= 30
+
+
+@pytest.mark.anyio
+async def test_overlapping_async_runs_are_skipped():
+    wheel = TimerWheel(tick=0.005)
+
+    async def slow():
+        await asyncio.sleep(0.05)
+
+    job = wheel.call_every(0.01, slow)
+    driver = asyncio.create_task(wheel.run())
+    await asyncio.sleep(0.06)
+    driver.cancel()
+    await asyncio.gather(driver, return_exceptions=True)
+    assert job.runs == 1
+    assert job.overruns >= 2
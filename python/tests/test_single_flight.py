@@ -0,0 +1,143 @@
+import asyncio
+import sys
+import pytest
+
+try:
+    from single_flight import SingleFlight
+except ImportError:
+    import pathlib
+    PYTHON_DIR_PATH = str(pathlib.Path(__file__).parent.parent.resolve())
+    if PYTHON_DIR_PATH not in sys.path:
+        sys.path.insert(0, PYTHON_DIR_PATH)
+    from single_flight import SingleFlight
+
+
+@pytest.mark.anyio
+async def test_concurrent_calls_share_one_request_and_ttl_cache():
+    flights = SingleFlight(timeout=1.0, ttl=60.0)
+    started = []
+
+    async def sample():
+        started.append(1)
+        await asyncio.sleep(0.02)
+        return "answer"
+
+    results = await asyncio.gather(*(flights.do(("hi", 100), sample) for _ in range(5)))
+    assert results == ["answer"] * 5
+    assert len(started) == 1
+    assert await flights.do(("hi", 100), sample) == "answer"  # Served from the TTL cache.
+    assert await flights.do(("other", 100), sample) == "answer"
+    stats = flights.stats()
+    assert (stats["executions"], stats["shared"], stats["cache_hits"]) == (2, 4, 1)
+    assert stats["in_flight"] == 0
+
+
+@pytest.mark.anyio
+async def test_failures_are_shared_but_not_cached():
+    flights = SingleFlight(timeout=1.0, ttl=60.0)
+    attempts = []
+
+    async def failing():
+        attempts.append(1)
+        await asyncio.sleep(0.01)
+        raise ValueError("sampler failed")
+
+    results = await asyncio.gather(flights.do("k", failing), flights.do("k", failing), return_exceptions=True)
+    assert all(isinstance(r, ValueError) for r in results)
+    with pytest.raises(ValueError):
+        await flights.do("k", failing)
+    assert len(attempts) == 2
+    assert flights.stats()["errors"] == 2
+
+
+@pytest.mark.anyio
+async def test_timeout_and_cancellation_release_the_shared_request():
+    flights = SingleFlight(timeout=0.03)
+    cancelled = asyncio.Event()
+
+    async def hang():
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    with pytest.raises(TimeoutError):
+        await flights.do("slow", hang)
+    await asyncio.wait_for(cancelled.wait(), 1)
+    assert flights.stats()["timeouts"] == 1
+
+    # Cancelling one of two waiters keeps the request alive for the other.
+    flights.timeout = None
+    release = asyncio.Event()
+
+    async def wait_for_release():
+        await release.wait()
+        return "done"
+
+    first = asyncio.create_task(flights.do("shared", wait_for_release))
+    second = asyncio.create_task(flights.do("shared", wait_for_release))
+    await asyncio.sleep(0.01)
+    first.cancel()
+    await asyncio.sleep(0.01)
+    release.set()
+    assert await second == "done"
+    assert first.cancelled()
+    assert flights.stats()["cancelled"] == 1
+
+
+@pytest.mark.anyio
+async def test_disabled_runs_every_call():
+    flights = SingleFlight(ttl=60.0, enabled=False)
+    runs = []
+
+    async def sample():
+        runs.append(1)
+        return len(runs)
+
+    assert await asyncio.gather(flights.do("k", sample), flights.do("k", sample)) == [1, 2]
+    assert flights.stats()["shared"] == 0 and flights.stats()["cache_hits"] == 0
+
+
+@pytest.mark.anyio
+async def test_admission_inside_the_flight_takes_one_slot_per_request():
+    from admission import AdmissionController
+
+    admission = AdmissionController(global_limit=4, global_queue=0)
+    flights = SingleFlight(timeout=1.0)
+
+    @admission.limited(limit=1, max_queue=0, name="sample_llm")
+    async def request_sample(session, prompt):
+        await asyncio.sleep(0.02)
+        return f"{session}: {prompt}"
+
+    # Ten identical calls would shed nine of them if each had to take the single slot.
+    results = await asyncio.gather(*(flights.do(("s1", "hi"), lambda: request_sample("s1", "hi")) for _ in range(10)))
+    assert results == ["s1: hi"] * 10
+    assert admission.stats()["sample_llm_admitted"] == 1
+    assert admission.stats()["sample_llm_rejected"] == 0
+
+
+@pytest.mark.anyio
+async def test_caller_arriving_after_the_last_waiter_left_gets_a_fresh_request():
+    flights = SingleFlight(timeout=1.0)
+    release = asyncio.Event()
+
+    async def request():
+        try:
+            await release.wait()
+        except asyncio.CancelledError:
+            await asyncio.sleep(0.02)  # Cleanup keeps the cancelled request pending a while.
+            raise
+        return "done"
+
+    first = asyncio.create_task(flights.do("k", request))
+    await asyncio.sleep(0.01)
+    first.cancel()
+    await asyncio.sleep(0.005)  # The last waiter has left; its request is still cancelling.
+    second = asyncio.create_task(flights.do("k", request))
+    await asyncio.sleep(0.01)
+    release.set()
+    assert await second == "done"
+    assert first.cancelled()
+    assert flights.stats()["executions"] == 2
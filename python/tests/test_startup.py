@@ -0,0 +1,26 @@
+import sys
+
+try:
+    from startup import check_budget, summarize_startup
+except ImportError:
+    import pathlib
+    PYTHON_DIR_PATH = str(pathlib.Path(__file__).parent.parent.resolve())
+    if PYTHON_DIR_PATH not in sys.path:
+        sys.path.insert(0, PYTHON_DIR_PATH)
+    from startup import check_budget, summarize_startup
+
+
+def test_summary_and_budget_check():
+    runs = [
+        {"initialize_ms": 300.0, "import_ms": 120.0, "setup_ms": 5.0, "ready_ms": 140.0},
+        {"initialize_ms": 900.0, "import_ms": 400.0, "setup_ms": 6.0, "ready_ms": 420.0},
+        {"initialize_ms": 350.0, "import_ms": 130.0, "setup_ms": 4.0},
+    ]
+    summary = summarize_startup(runs)
+    assert summary["runs"] == 3
+    assert summary["initialize_ms"] == {"p50": 350.0, "max": 900.0}
+    assert summary["ready_ms"] == {"p50": 140.0, "max": 420.0}
+
+    assert check_budget(summary, budget_ms=500) == []
+    assert "exceeds" in check_budget(summary, budget_ms=320)[0]
+    assert check_budget(summarize_startup([]), budget_ms=500)